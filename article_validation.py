@@ -0,0 +1,285 @@
+#!/usr/bin/env python3
+"""
+AI Tools Hub - Validación de artículos generados
+Reglas de calidad de los artículos de Gemini y qué hacer cuando no se
+cumplen:
+
+- Regenerar (fatal): falta título o contenido, el contenido se queda corto
+  (menos de MIN_WORDS palabras) o no tiene la estructura de secciones H2.
+- Reparar (sin otra llamada): meta description fuera de 150-160 caracteres,
+  tags faltantes o de más, H1 dentro del contenido, TL;DR ausente o tiempo
+  de lectura inválido.
+- Aceptar con aviso: contenido fuera del rango objetivo 1200-1500 palabras
+  pero por encima del mínimo.
+
+ArticleStreamWatcher aplica las reglas fatales mientras la respuesta llega
+en streaming (gemini_client.generate_json_stream), así una generación mala
+se corta en cuanto se detecta en lugar de esperar la respuesta completa.
+"""
+
+import json
+import re
+
+from gemini_client import ResponseRejected
+
+TARGET_WORDS = (1200, 1500)
+MIN_WORDS = 1000            # Por debajo se regenera
+RUNAWAY_WORDS = 4000        # Por encima la salida se considera degenerada
+MIN_H2_SECTIONS = 3
+H2_DEADLINE_WORDS = 400     # Palabras de contenido sin ningún H2 antes de cortar
+META_DESCRIPTION_RANGE = (150, 160)
+TAGS_RANGE = (5, 7)
+WORDS_PER_MINUTE = 230
+PREAMBLE_LIMIT = 200        # Caracteres antes del '{' inicial tolerados (```json, espacios)
+PROGRESS_EVERY_WORDS = 300
+
+REQUIRED_FIELDS = ('title', 'meta_description', 'content')
+
+_WORD_PATTERN = re.compile(r"[A-Za-z0-9][A-Za-z0-9'’-]*")
+_H1_PATTERN = re.compile(r'^# (.+)$', re.MULTILINE)
+_H2_PATTERN = re.compile(r'^## ', re.MULTILINE)
+_TLDR_PATTERN = re.compile(r'tl;?dr|quick summary', re.IGNORECASE)
+
+
+def count_words(text: str) -> int:
+    return len(_WORD_PATTERN.findall(text))
+
+
+def h2_count(content: str) -> int:
+    return len(_H2_PATTERN.findall(content))
+
+
+def has_tldr(content: str) -> bool:
+    """Indica si hay un TL;DR o "Quick Summary" en el primer tercio del artículo."""
+    return bool(_TLDR_PATTERN.search(content[:max(len(content) // 3, 1500)]))
+
+
+def fatal_problems(article) -> list:
+    """Problemas que obligan a regenerar el artículo (lista vacía si no hay)."""
+    if not isinstance(article, dict):
+        return ["response is not a JSON object"]
+    problems = [
+        f"missing or empty '{field}'" for field in REQUIRED_FIELDS
+        if not isinstance(article.get(field), str) or not article[field].strip()
+    ]
+    content = article.get('content')
+    if isinstance(content, str) and content.strip():
+        words = count_words(content)
+        if words < MIN_WORDS:
+            problems.append(f"content too short ({words} words, minimum {MIN_WORDS})")
+        elif words > RUNAWAY_WORDS:
+            problems.append(f"content too long ({words} words)")
+        sections = h2_count(content)
+        if sections < MIN_H2_SECTIONS:
+            problems.append(f"only {sections} H2 sections (minimum {MIN_H2_SECTIONS})")
+    return problems
+
+
+def _trim_meta_description(text: str) -> str:
+    high = META_DESCRIPTION_RANGE[1]
+    text = ' '.join(text.split())
+    if len(text) <= high:
+        return text
+    cut = text[:high - 1].rsplit(' ', 1)[0].rstrip(' ,;:-')
+    return cut + '…'
+
+
+def _first_paragraph(content: str) -> str:
+    for block in content.split('\n\n'):
+        block = block.strip()
+        if block and not block.startswith(('#', '-', '*', '>', '|', '```')):
+            return re.sub(r'[*_`]|\[([^\]]*)\]\([^)]*\)', r'\1', block)
+    return ""
+
+
+def repair_article(article: dict, topic: dict) -> list:
+    """Corrige en el sitio los problemas reparables; retorna las notas de lo hecho.
+
+    Se asume que ``fatal_problems(article)`` está vacío.
+    """
+    notes = []
+    content = article['content'].strip()
+
+    # El título va en la plantilla: un H1 igual al título sobra y el resto pasa a H2
+    first_h1 = _H1_PATTERN.search(content)
+    if first_h1 and content.startswith('# '):
+        content = content[first_h1.end():].lstrip('\n')
+        notes.append("removed duplicated H1 title from content")
+    if _H1_PATTERN.search(content):
+        content = _H1_PATTERN.sub(r'## \1', content)
+        notes.append("demoted H1 headings to H2")
+
+    meta = ' '.join(article['meta_description'].split())
+    low, high = META_DESCRIPTION_RANGE
+    if len(meta) > high:
+        meta = _trim_meta_description(meta)
+        notes.append(f"meta description trimmed to {len(meta)} chars")
+    elif len(meta) < low:
+        extended = _trim_meta_description(f"{meta} {_first_paragraph(content)}") if len(meta) < 120 else meta
+        if extended != meta:
+            meta = extended
+            notes.append(f"meta description extended to {len(meta)} chars")
+    article['meta_description'] = meta
+
+    if not has_tldr(content):
+        first_h2 = _H2_PATTERN.search(content)
+        tldr = f"## TL;DR\n\n{meta}\n\n"
+        if first_h2:
+            content = content[:first_h2.start()] + tldr + content[first_h2.start():]
+        else:
+            content = tldr + content
+        notes.append("added missing TL;DR section")
+    article['content'] = content
+
+    # Tags: sin vacíos ni repetidos, máximo 7; si faltan se completan con las keywords del tema
+    tags = article.get('tags') if isinstance(article.get('tags'), list) else []
+    clean_tags = []
+    for tag in [str(tag).strip() for tag in tags]:
+        if tag and tag.lower() not in {t.lower() for t in clean_tags}:
+            clean_tags.append(tag)
+    for tag in [topic.get('keyword', '')] + list(topic.get('secondary_keywords', [])):
+        if len(clean_tags) >= TAGS_RANGE[0]:
+            break
+        if tag and tag.lower() not in {t.lower() for t in clean_tags}:
+            clean_tags.append(tag)
+    clean_tags = clean_tags[:TAGS_RANGE[1]]
+    if clean_tags != tags:
+        notes.append(f"tags normalized ({len(tags)} -> {len(clean_tags)})")
+    article['tags'] = clean_tags
+
+    words = count_words(content)
+    read_time = max(1, round(words / WORDS_PER_MINUTE))
+    if not isinstance(article.get('estimated_read_time'), int) or article['estimated_read_time'] <= 0:
+        article['estimated_read_time'] = read_time
+        notes.append(f"estimated read time set to {read_time} min")
+
+    if not TARGET_WORDS[0] <= words <= TARGET_WORDS[1]:
+        notes.append(f"accepted with {words} words (target {TARGET_WORDS[0]}-{TARGET_WORDS[1]})")
+    return notes
+
+
+class ArticleStreamWatcher:
+    """Sigue el JSON de un artículo mientras llega y corta si se sale de las reglas.
+
+    Un escáner incremental (sin re-parsear lo ya recibido) detecta las
+    claves de primer nivel y cuándo termina cada valor; los campos completos
+    se validan al cerrarse y el campo ``content`` también mientras llega
+    (estructura H2, salida desbocada). ``progress(words)`` se llama cada
+    PROGRESS_EVERY_WORDS palabras de contenido.
+    """
+
+    def __init__(self, progress=None):
+        self.progress = progress
+        self.reset()
+
+    def reset(self):
+        self.buffer = ''
+        self.pos = 0
+        self.depth = 0
+        self.state = 'start'   # start, key, key_string, colon, value, string, nested, primitive, after, done
+        self.in_string = False
+        self.escape = False
+        self.key = None
+        self.value_start = None
+        self.fields = {}
+        self.reported_words = 0
+
+    def _reject(self, reason: str):
+        raise ResponseRejected(reason)
+
+    def _complete(self, key: str, raw: str):
+        try:
+            value = json.loads(raw)
+        except ValueError:
+            self._reject(f"invalid JSON value for '{key}'")
+        self.fields[key] = value
+        if key in REQUIRED_FIELDS and (not isinstance(value, str) or not value.strip()):
+            self._reject(f"'{key}' is empty or not a string")
+        if key == 'content':
+            words = count_words(value)
+            if words < MIN_WORDS:
+                self._reject(f"content too short ({words} words, minimum {MIN_WORDS})")
+
+    def _check_partial_content(self):
+        raw = self.buffer[self.value_start:]
+        words = count_words(raw.replace('\\n', ' '))
+        if self.progress and words >= self.reported_words + PROGRESS_EVERY_WORDS:
+            self.reported_words = words - words % PROGRESS_EVERY_WORDS
+            self.progress(self.reported_words)
+        if words > RUNAWAY_WORDS:
+            self._reject(f"content exceeded {RUNAWAY_WORDS} words")
+        if words >= H2_DEADLINE_WORDS and '## ' not in raw:
+            self._reject(f"no H2 section in the first {H2_DEADLINE_WORDS} words")
+
+    def feed(self, chunk: str):
+        """Procesa un trozo nuevo de la respuesta (lanza ResponseRejected si se sale del esquema)."""
+        self.buffer += chunk
+        buf = self.buffer
+        for i in range(self.pos, len(buf)):
+            c = buf[i]
+            if self.in_string:
+                if self.escape:
+                    self.escape = False
+                elif c == '\\':
+                    self.escape = True
+                elif c == '"':
+                    self.in_string = False
+                    if self.depth == 1 and self.state == 'key_string':
+                        self.key = json.loads(buf[self.value_start:i + 1])
+                        self.state = 'colon'
+                    elif self.depth == 1 and self.state == 'string':
+                        self._complete(self.key, buf[self.value_start:i + 1])
+                        self.state = 'after'
+                continue
+            if c.isspace():
+                continue
+            if self.state == 'start':
+                if c == '{':
+                    self.depth = 1
+                    self.state = 'key'
+                elif c == '[':
+                    self._reject("response is a JSON array, expected an object")
+                elif i >= PREAMBLE_LIMIT:
+                    self._reject("response does not start with a JSON object")
+                continue
+            if c == '"':
+                self.in_string = True
+                if self.depth == 1 and self.state == 'key':
+                    self.value_start = i
+                    self.state = 'key_string'
+                elif self.depth == 1 and self.state == 'value':
+                    self.value_start = i
+                    self.state = 'string'
+            elif c in '{[':
+                if self.depth == 1 and self.state == 'value':
+                    self.value_start = i
+                    self.state = 'nested'
+                self.depth += 1
+            elif c in '}]':
+                if self.depth == 1 and self.state == 'primitive':
+                    self._complete(self.key, buf[self.value_start:i].strip())
+                self.depth -= 1
+                if self.depth == 1 and self.state == 'nested':
+                    self._complete(self.key, buf[self.value_start:i + 1])
+                    self.state = 'after'
+                elif self.depth == 0:
+                    self.state = 'done'
+            elif self.depth == 1:
+                if c == ':' and self.state == 'colon':
+                    self.state = 'value'
+                elif c == ',':
+                    if self.state == 'primitive':
+                        self._complete(self.key, buf[self.value_start:i].strip())
+                    self.state = 'key'
+                elif self.state == 'value':
+                    self.value_start = i
+                    self.state = 'primitive'
+        self.pos = len(buf)
+        if self.state == 'string' and self.key == 'content':
+            self._check_partial_content()
+
+    def finish(self, data):
+        """Validación final del artículo completo (también para respuestas cacheadas)."""
+        problems = fatal_problems(data)
+        if problems:
+            self._reject('; '.join(problems))
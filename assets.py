@@ -0,0 +1,230 @@
+#!/usr/bin/env python3
+"""
+AI Tools Hub - Pipeline de assets
+Minifica el CSS/JS de static/, los publica con el hash del contenido en el
+nombre (``static/css/style.3f9a1c2b7d.css``) para que los CDN y navegadores
+los cacheen para siempre, y escribe copias precomprimidas ``.gz`` y ``.br``
+(la ``.br`` requiere el paquete ``brotli`` de requirements.txt; sin él
+solo se escribe la ``.gz``).
+
+Las páginas enlazan los assets con las variables de plantilla de ASSETS
+(``{{ root }}{{ style_css }}``), resueltas por asset_urls().
+
+Las páginas HTML del sitio pasan por minify_html() y write_precompressed()
+al escribirse (ver blog_generator.write_page).
+"""
+
+import gzip
+import hashlib
+import re
+from functools import lru_cache
+from pathlib import Path
+
+STATIC_DIR = Path(__file__).parent / "static"
+
+# Variable de plantilla -> archivo dentro de static/
+ASSETS = {
+    'style_css': "css/style.css",
+    'main_js': "js/main.js",
+}
+
+HASH_LENGTH = 10
+PRECOMPRESS_MIN_BYTES = 256  # Archivos más chicos no valen la pena comprimir
+
+_CSS_COMMENT = re.compile(r'/\*.*?\*/', re.DOTALL)
+_CSS_SPACES = re.compile(r'\s+')
+_CSS_PUNCTUATION = re.compile(r'\s*([{};,>])\s*')
+_CSS_COLON = re.compile(r':\s+')
+
+
+def minify_css(source: str) -> str:
+    """Quita comentarios y espacios sobrantes del CSS.
+
+    Los espacios alrededor de ``+``/``-`` se conservan (``calc()`` los
+    necesita) y también los que van antes de ``:`` (``a :hover`` no es lo
+    mismo que ``a:hover``).
+    """
+    css = _CSS_COMMENT.sub('', source)
+    css = _CSS_SPACES.sub(' ', css)
+    css = _CSS_PUNCTUATION.sub(r'\1', css)
+    css = _CSS_COLON.sub(':', css)
+    return css.replace(';}', '}').strip() + '\n'
+
+
+# Después de estos caracteres una '/' abre una expresión regular, no una división
+_REGEX_PRECEDERS = set('(,=:[!&|?{};+-*%<>~^')
+
+
+def minify_js(source: str) -> str:
+    """Minificación conservadora de JavaScript.
+
+    Quita comentarios, indentación y líneas vacías respetando strings,
+    template literals y expresiones regulares. Los saltos de línea se
+    conservan, así que la inserción automática de ``;`` sigue funcionando
+    igual que en el original.
+    """
+    out = []
+    i, n = 0, len(source)
+    previous = ''  # Último carácter significativo emitido
+    while i < n:
+        c = source[i]
+        if c in '"\'`':
+            end = i + 1
+            while end < n and source[end] != c:
+                end += 2 if source[end] == '\\' else 1
+            out.append(source[i:end + 1])
+            previous = c
+            i = end + 1
+        elif source.startswith('//', i):
+            i = source.find('\n', i)
+            i = n if i == -1 else i
+        elif source.startswith('/*', i):
+            end = source.find('*/', i + 2)
+            i = n if end == -1 else end + 2
+            out.append(' ')
+        elif c == '/' and (previous in _REGEX_PRECEDERS or previous == ''):
+            end, in_class = i + 1, False
+            while end < n and (source[end] != '/' or in_class):
+                if source[end] == '\\':
+                    end += 1
+                elif source[end] == '[':
+                    in_class = True
+                elif source[end] == ']':
+                    in_class = False
+                end += 1
+            out.append(source[i:end + 1])
+            previous = '/'
+            i = end + 1
+        else:
+            out.append(c)
+            if not c.isspace():
+                previous = c
+            i += 1
+    lines = (line.strip() for line in ''.join(out).splitlines())
+    return '\n'.join(line for line in lines if line) + '\n'
+
+
+# Elementos cuyo contenido se copia tal cual (los espacios importan o no es HTML)
+_HTML_PRESERVE = re.compile(r'<(pre|code|textarea|script|style)\b[^>]*>.*?</\1\s*>',
+                            re.DOTALL | re.IGNORECASE)
+_HTML_COMMENT = re.compile(r'<!--(?!\[if).*?-->', re.DOTALL)
+_HTML_SPACES = re.compile(r'\s+')
+# Alrededor de tags de bloque los espacios no se ven, así que se pueden quitar
+_HTML_BLOCK_TAG = re.compile(
+    r'\s*(</?(?:!doctype|html|head|body|meta|link|title|header|footer|main|nav|section|'
+    r'article|aside|div|p|h[1-6]|ul|ol|li|dl|dt|dd|table|thead|tbody|tr|th|td|form|'
+    r'blockquote|figure|figcaption|hr|br|ins|noscript)\b[^>]*>)\s*',
+    re.IGNORECASE,
+)
+_HTML_BLOCK_PRESERVED = ('pre', 'script', 'style')
+
+
+def _minify_html_text(html: str) -> str:
+    html = _HTML_COMMENT.sub('', html)
+    html = _HTML_SPACES.sub(' ', html)
+    return _HTML_BLOCK_TAG.sub(r'\1', html)
+
+
+def minify_html(html: str) -> str:
+    """Minificación segura de una página HTML.
+
+    Quita comentarios (salvo los condicionales ``<!--[if``), colapsa los
+    espacios y elimina los que rodean tags de bloque. El contenido de
+    ``<pre>``, ``<code>``, ``<textarea>``, ``<script>`` y ``<style>`` no se
+    toca, así los bloques de código de codehilite quedan intactos.
+    """
+    out = []
+    last = 0
+    block = False  # El último elemento preservado es de bloque
+    for match in _HTML_PRESERVE.finditer(html):
+        text = _minify_html_text(html[last:match.start()])
+        if block:
+            text = text.lstrip()
+        block = match.group(1).lower() in _HTML_BLOCK_PRESERVED
+        out.append(text.rstrip() if block else text)
+        out.append(match.group(0))
+        last = match.end()
+    text = _minify_html_text(html[last:])
+    out.append(text.lstrip() if block else text)
+    return ''.join(out).strip() + '\n'
+
+
+MINIFIERS = {'.css': minify_css, '.js': minify_js}
+
+
+@lru_cache(maxsize=None)
+def build_asset(name: str, static_dir: Path = STATIC_DIR) -> tuple:
+    """Retorna ``(ruta publicada, contenido minificado)`` de un asset de static/."""
+    path = Path(static_dir) / name
+    source = path.read_text(encoding='utf-8')
+    minify = MINIFIERS.get(path.suffix)
+    data = (minify(source) if minify else source).encode('utf-8')
+    digest = hashlib.sha256(data).hexdigest()[:HASH_LENGTH]
+    published = Path("static") / path.parent.relative_to(static_dir) / f"{path.stem}.{digest}{path.suffix}"
+    return published.as_posix(), data
+
+
+def asset_urls(static_dir: Path = STATIC_DIR) -> dict:
+    """Variables de plantilla con la ruta publicada (relativa a la raíz) de cada asset."""
+    return {variable: build_asset(name, static_dir)[0] for variable, name in ASSETS.items()}
+
+
+def assets_fingerprint(static_dir: Path = STATIC_DIR) -> bytes:
+    """Rutas publicadas de todos los assets, para invalidar las páginas que los enlazan."""
+    return '\0'.join(sorted(asset_urls(static_dir).values())).encode()
+
+
+def write_precompressed(path: Path, data: bytes) -> list:
+    """Escribe ``path.gz`` (y ``path.br`` si hay brotli) junto al archivo.
+
+    El gzip usa mtime fijo para que la salida sea reproducible byte a byte.
+    Las variantes que no se escriben (archivo chico, sin brotli) se borran
+    para que nunca quede una copia comprimida de una versión anterior.
+    Retorna la lista de archivos escritos.
+    """
+    gz_path = path.with_name(path.name + '.gz')
+    br_path = path.with_name(path.name + '.br')
+    if len(data) < PRECOMPRESS_MIN_BYTES:
+        gz_path.unlink(missing_ok=True)
+        br_path.unlink(missing_ok=True)
+        return []
+    with gzip.GzipFile(gz_path, 'wb', compresslevel=9, mtime=0) as f:
+        f.write(data)
+    try:
+        import brotli
+    except ImportError:
+        br_path.unlink(missing_ok=True)
+        return [gz_path]
+    br_path.write_bytes(brotli.compress(data, quality=11))
+    return [gz_path, br_path]
+
+
+def remove_published(path: Path):
+    """Borra un archivo publicado junto con sus variantes precomprimidas."""
+    for target in (path, path.with_name(path.name + '.gz'), path.with_name(path.name + '.br')):
+        target.unlink(missing_ok=True)
+
+
+def write_assets(output_dir: Path, static_dir: Path = STATIC_DIR) -> dict:
+    """Publica los assets minificados y con hash en ``output_dir``.
+
+    Como el nombre depende del contenido, un asset que ya existe no se
+    vuelve a escribir; las versiones anteriores de cada asset se borran.
+    Retorna ``{ruta publicada: (bytes originales, bytes minificados)}`` de
+    los assets escritos en esta llamada.
+    """
+    written = {}
+    for name in ASSETS.values():
+        published, data = build_asset(name, static_dir)
+        target = Path(output_dir) / published
+        target.parent.mkdir(parents=True, exist_ok=True)
+        source = Path(static_dir) / name
+        for stale in target.parent.glob(f"{source.stem}.*{source.suffix}*"):
+            if not stale.name.startswith(target.name):
+                stale.unlink()
+        if target.exists():
+            continue
+        target.write_bytes(data)
+        write_precompressed(target, data)
+        written[published] = (source.stat().st_size, len(data))
+    return written
@@ -0,0 +1,53 @@
+#!/usr/bin/env python3
+"""
+AI Tools Hub - Benchmark de arranque
+Mide cuánto tarda en importarse cada script en un proceso nuevo, para vigilar
+que el camino de solo-build (sin llamadas a la API) no cargue el SDK de Gemini.
+
+Uso: python benchmarks/startup_benchmark.py [--runs 10]
+"""
+
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+_BASE_DIR = Path(__file__).resolve().parent.parent
+
+# (etiqueta, código a importar en un intérprete limpio)
+CASES = [
+    ("python (baseline)", "pass"),
+    ("import blog_generator", "import blog_generator"),
+    ("import daily_automation", "import daily_automation"),
+    ("import google.genai (reference)", "from google import genai"),
+]
+
+
+def time_import(code: str, runs: int) -> float:
+    """Retorna el tiempo medio (segundos) de arrancar Python y ejecutar ``code``."""
+    total = 0.0
+    for _ in range(runs):
+        start = time.perf_counter()
+        subprocess.run([sys.executable, "-c", code], cwd=_BASE_DIR, check=True)
+        total += time.perf_counter() - start
+    return total / runs
+
+
+def main(runs: int):
+    print(f"Startup time, mean of {runs} runs")
+    print("=" * 50)
+    for label, code in CASES:
+        print(f"  {label:<34} {time_import(code, runs) * 1000:8.1f} ms")
+    loaded = subprocess.run(
+        [sys.executable, "-c", "import sys, blog_generator; print('google.genai' in sys.modules)"],
+        cwd=_BASE_DIR, capture_output=True, text=True, check=True,
+    ).stdout.strip()
+    print(f"\n  google.genai loaded by blog_generator: {loaded}")
+
+
+if __name__ == "__main__":
+    import argparse
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--runs', type=int, default=10, help='Number of runs per case')
+    args = parser.parse_args()
+    main(args.runs)
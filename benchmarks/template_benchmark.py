@@ -0,0 +1,72 @@
+#!/usr/bin/env python3
+"""
+AI Tools Hub - Benchmark de plantillas
+Mide cuántas páginas por segundo generan generate_html_post() y
+generate_homepage(). markdown_to_html() y render_markdown() se reemplazan
+por la identidad para medir solo el costo del layout.
+
+Uso:
+    python benchmarks/template_benchmark.py [--pages 20000] [--repeat 5]
+    python benchmarks/template_benchmark.py --tree /ruta/a/otro/checkout
+
+Con --tree se importa blog_generator desde otro checkout (por ejemplo un
+``git worktree`` de una versión anterior) para comparar antes y después.
+Cada medición se repite ``--repeat`` veces y se informa la mejor, porque
+una sola pasada de la homepage dura pocos milisegundos y es muy ruidosa.
+"""
+
+import sys
+import time
+from pathlib import Path
+
+_BASE_DIR = Path(__file__).resolve().parent.parent
+
+
+def sample_posts(count: int) -> list:
+    """Posts sintéticos con el mismo tamaño aproximado que los reales."""
+    paragraph = "<p>" + "AI writing tools help freelancers ship content faster. " * 20 + "</p>\n"
+    return [{
+        'title': f"Sample AI Tool Review #{i}",
+        'meta_description': "An honest, hands-on review of a popular AI writing tool for freelancers." * 2,
+        'content': paragraph * 30,
+        'tags': ["ai writing", "review", "freelancers", "productivity", "seo"],
+        'estimated_read_time': 7,
+        'keyword': f"sample review {i}",
+        'slug': f"sample-ai-tool-review-{i}",
+        'date': "2026-01-01",
+        'category': "Reviews",
+    } for i in range(count)]
+
+
+def bench(label: str, func, items: list, repeat: int):
+    elapsed = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for item in items:
+            func(item)
+        elapsed = min(elapsed, time.perf_counter() - start)
+    print(f"  {label:<20} {len(items) / elapsed:10.0f} pages/s  ({elapsed * 1000:.1f} ms total)")
+
+
+def main(pages: int, tree: Path, repeat: int):
+    sys.path.insert(0, str(tree))
+    import blog_generator
+    blog_generator.markdown_to_html = lambda md_content: md_content
+    blog_generator.render_markdown = lambda md_content: (md_content, [])
+    
+    posts = sample_posts(pages)
+    print(f"Template benchmark ({tree})")
+    print("=" * 50)
+    bench("generate_html_post", blog_generator.generate_html_post, posts, repeat)
+    bench("generate_homepage", blog_generator.generate_homepage, [posts] * max(1, pages // 10), repeat)
+
+
+if __name__ == "__main__":
+    import argparse
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--pages', type=int, default=20000, help='Number of pages to render')
+    parser.add_argument('--tree', type=Path, default=_BASE_DIR,
+                        help='Checkout to import blog_generator from')
+    parser.add_argument('--repeat', type=int, default=5, help='Runs per measurement (best is reported)')
+    args = parser.parse_args()
+    main(args.pages, args.tree.resolve(), args.repeat)
@@ -9,10 +9,24 @@ import os
 import json
 import re
 import hashlib
+import threading
+from concurrent.futures import ProcessPoolExecutor
 from datetime import datetime, timezone
+from functools import lru_cache, partial
 from pathlib import Path
-from google import genai
-from google.genai import types
+from urllib.parse import urlsplit
+from article_validation import ArticleStreamWatcher, repair_article
+from assets import (asset_urls, assets_fingerprint, minify_html, remove_published,
+                    write_assets, write_precompressed)
+from critical_css import inline_critical_css
+from markdown_render import config_fingerprint as markdown_fingerprint, render_cache, render_markdown
+from gemini_client import ResponseRejected, generate_json, generate_json_stream
+from feeds import AtomWriter, RssWriter
+from near_duplicates import content_shingles, encode_signature, minhash
+from related_posts import update_related_posts
+from search_index import update_search_index
+from sitemaps import SITEMAP_INDEX_NAME, SitemapWriter
+from template_engine import Template, get_template, templates_fingerprint
 
 # ============================================================
 # CONFIGURACIÓN
@@ -34,21 +48,80 @@ AFFILIATE_LINKS = {
     "grammarly": "https://grammarly.go2cloud.org/aff_c?offer_id=7&aff_id=156f1f6b",
 }
 
+# Nombres de marca que se enlazan en el contenido, por programa de AFFILIATE_LINKS
+AFFILIATE_BRANDS = {
+    "writesonic": ["Writesonic"],
+    "jasper": ["Jasper AI", "Jasper.ai"],
+    "surfer_seo": ["Surfer SEO"],
+    "grammarly": ["Grammarly"],
+    "canva": ["Canva"],
+}
+AFFILIATE_LINK_CAP = 2  # Máximo de links por programa en cada artículo
+
+# URLs de afiliado usados antes por cada programa (programa -> [URLs]); relink
+# los actualiza al de AFFILIATE_LINKS
+AFFILIATE_PREVIOUS_URLS = {}
+
 # Rutas relativas al directorio del script (funciona tanto local como en GitHub Actions)
 _BASE_DIR = Path(__file__).parent
 OUTPUT_DIR = _BASE_DIR / "output"
 POSTS_DIR = _BASE_DIR / "posts"
 
+# Índice compacto de posts (solo metadatos, una línea JSON por post)
+POST_INDEX_FILE = POSTS_DIR / "index.jsonl"
+POST_INDEX_FIELDS = (
+    'keyword', 'slug', 'title', 'date', 'category', 'tags',
+    'meta_description', 'estimated_read_time', 'updated',
+)
+# Tamaño y mtime con los que se verificó el hash de cada post (caché local, no versionada)
+POST_INDEX_STAT_FILE = _BASE_DIR / ".cache" / "post_index_stat.json"
+
+# Manifest del build incremental (hash de cada post y de la configuración).
+# Vive fuera de OUTPUT_DIR para no publicarse en GitHub Pages.
+BUILD_MANIFEST_FILE = _BASE_DIR / ".build_manifest.json"
+BUILD_MANIFEST_VERSION = 2
+
+# Páginas de categoría y archivo
+NAV_CATEGORIES = ("Reviews", "Comparisons", "Guides")  # Siempre enlazadas en el menú
+CATEGORY_PAGE_SIZE = 12
+
+# Páginas estáticas: archivo -> (título, meta description); el cuerpo está en templates/pages/
+STATIC_PAGES = {
+    "about.html": ("About Us", "AI Tools Hub is your trusted source for honest AI tool reviews, comparisons, and guides."),
+    "privacy.html": ("Privacy Policy", "How AI Tools Hub collects and uses data."),
+    "disclaimer.html": ("Affiliate Disclaimer", "How AI Tools Hub works with affiliate programs."),
+}
+
+# Feeds RSS/Atom (sitio completo y por categoría)
+FEED_SIZE = 20            # Entradas más recientes por feed
+FEED_FULL_CONTENT = True  # False: solo el resumen (meta_description)
+
+# Artículos relacionados en la barra lateral de cada post
+RELATED_POSTS_COUNT = 5
+
+# Generación de artículos (reglas de validación en article_validation.py)
+ARTICLE_STREAMING = True  # Recibir el artículo en streaming y validarlo mientras llega
+ARTICLE_ATTEMPTS = 3      # Generaciones completas antes de rendirse
+
+# Tabla de contenidos de los artículos
+TOC_MIN_HEADINGS = 3  # H2/H3 necesarios para mostrarla
+TOC_MAX_LEVEL = 3     # Nivel de encabezado más profundo incluido
+
+# Salida HTML
+MINIFY_HTML = True          # Minificar las páginas (además se escriben sus variantes .gz/.br)
+INLINE_CRITICAL_CSS = True  # Incrustar el CSS de la parte visible y cargar la hoja completa en diferido
+
 # ============================================================
-# CLIENTE GEMINI (inicializado al momento de uso)
+# GENERACIÓN DE ARTÍCULOS (Gemini vía gemini_client)
 # ============================================================
-def _get_client():
-    """Retorna el cliente Gemini configurado."""
-    return genai.Client(api_key=os.environ.get("GEMINI_API_KEY"))
-
+def generate_article(topic: dict, stream: bool = ARTICLE_STREAMING) -> dict:
+    """Genera un artículo SEO-optimizado usando Gemini.
 
-def generate_article(topic: dict) -> dict:
-    """Genera un artículo SEO-optimizado usando Gemini."""
+    La respuesta se valida con article_validation: con ``stream`` la
+    generación se corta en cuanto se sale de las reglas (sin esperar al
+    resto), los problemas graves provocan una nueva generación (hasta
+    ARTICLE_ATTEMPTS) y los menores se reparan sin volver a llamar a la API.
+    """
     
     prompt = f"""Write a comprehensive, SEO-optimized blog article about: "{topic['title']}"
 
@@ -77,13 +150,24 @@ Format the response as JSON with these fields:
 """
 
     full_prompt = """You are an expert content writer specializing in AI tools, productivity, and technology. You write engaging, SEO-optimized articles that genuinely help readers make informed decisions about AI tools.\n\n""" + prompt
-    ai_client = _get_client()
-    response = ai_client.models.generate_content(
-        model="gemini-2.0-flash",
-        contents=full_prompt,
-        config=types.GenerateContentConfig(response_mime_type="application/json")
-    )
-    article_data = json.loads(response.text)
+    contents = full_prompt
+    for attempt in range(ARTICLE_ATTEMPTS):
+        watcher = ArticleStreamWatcher(progress=lambda words: print(f"  … {words} words received"))
+        try:
+            if stream:
+                article_data = generate_json_stream(contents, watcher)
+            else:
+                article_data = generate_json(contents, validate=watcher.finish)
+            break
+        except ResponseRejected as e:
+            if attempt + 1 >= ARTICLE_ATTEMPTS:
+                raise
+            print(f"  ✗ Article rejected ({e}); regenerating...")
+            contents = (full_prompt + f"\n\nIMPORTANT: a previous attempt was rejected because: {e}. "
+                        "Make sure the article meets every requirement above.")
+    
+    for note in repair_article(article_data, topic):
+        print(f"  🔧 {note}")
     article_data['keyword'] = topic['keyword']
     article_data['slug'] = generate_slug(article_data['title'])
     article_data['date'] = datetime.now(timezone.utc).strftime('%Y-%m-%d')
@@ -101,28 +185,161 @@ def generate_slug(title: str) -> str:
     return slug[:60]
 
 
+# ============================================================
+# LINKS DE AFILIADOS
+# ============================================================
+_AFFILIATE_ALIASES = {
+    alias: program
+    for program, aliases in AFFILIATE_BRANDS.items() if program in AFFILIATE_LINKS
+    for alias in aliases
+}
+
+# Un solo patrón que recorre el Markdown una vez: las alternativas protegidas
+# (código, títulos, links y HTML existentes) se consumen tal cual y solo las
+# menciones de marca que quedan fuera de ellas son candidatas a enlazarse.
+_AFFILIATE_PATTERN = re.compile(r"""
+      (?P<fence>^(?P<fence_mark>```|~~~)[\s\S]*?(?:^(?P=fence_mark)|\Z))
+    | (?P<heading>^\#{1,6}[^\n]*)
+    | (?P<code>(?P<ticks>`+)[\s\S]*?(?P=ticks))
+    | (?P<link>!?\[[^\]\n]*\]\((?P<link_url>[^)\s]*)[^)\n]*\))
+    | (?P<html><a\b[\s\S]*?</a>|<[^>\n]+>)
+    | (?P<url>https?://[^\s)>\]]+)
+    | \b(?P<brand>""" + '|'.join(
+        re.escape(alias) for alias in sorted(_AFFILIATE_ALIASES, key=len, reverse=True)
+    ) + r""")\b
+""", re.MULTILINE | re.VERBOSE)
+
+
+def _landing_page(url: str) -> tuple:
+    parts = urlsplit(url)
+    return parts.netloc.lower().removeprefix('www.'), parts.path.rstrip('/')
+
+
+_AFFILIATE_LANDING_PAGES = {_landing_page(url): program for program, url in AFFILIATE_LINKS.items()}
+
+
+def affiliate_program_for_link(url: str) -> str | None:
+    """Retorna el programa de afiliados de un link existente, si lo tiene.
+
+    Un link pertenece a un programa si apunta a su URL actual, a uno de sus
+    URLs anteriores (AFFILIATE_PREVIOUS_URLS) o a la misma página de destino
+    que el URL actual con otros parámetros (p. ej. un código de referido
+    viejo). El texto del link no cuenta: ``[Grammarly](.../blog/...)`` es un
+    link legítimo a otra página y no se toca.
+    """
+    for program, affiliate_url in AFFILIATE_LINKS.items():
+        if url == affiliate_url or url in AFFILIATE_PREVIOUS_URLS.get(program, ()):
+            return program
+    return _AFFILIATE_LANDING_PAGES.get(_landing_page(url))
+
+
+def apply_affiliate_links(content: str, rewrite: bool = False) -> tuple:
+    """Enlaza menciones de marca (y opcionalmente corrige links existentes).
+
+    Enlaza como máximo AFFILIATE_LINK_CAP menciones por programa en una sola
+    pasada, sin tocar bloques de código, títulos ni links existentes. Los
+    links que ya apuntan a un programa cuentan para su límite, así que
+    aplicar la función dos veces no agrega links nuevos. Con ``rewrite=True``
+    los links de un programa que apuntan a un URL viejo se actualizan al de
+    AFFILIATE_LINKS.
+    
+    Retorna ``(content, stats)`` con los contadores ``inserted`` y
+    ``rewritten`` por programa.
+    """
+    counts = dict.fromkeys(AFFILIATE_LINKS, 0)
+    stats = {program: {'inserted': 0, 'rewritten': 0} for program in AFFILIATE_LINKS}
+    
+    def replace(match):
+        if match.group('link'):
+            link = match.group(0)
+            if link.startswith('!'):  # Las imágenes no son links y no cuentan para el límite
+                return link
+            program = affiliate_program_for_link(match.group('link_url'))
+            if not program:
+                return link
+            counts[program] += 1
+            url = match.group('link_url')
+            if rewrite and url != AFFILIATE_LINKS[program]:
+                stats[program]['rewritten'] += 1
+                start, end = match.span('link_url')
+                offset = match.start()
+                return link[:start - offset] + AFFILIATE_LINKS[program] + link[end - offset:]
+            return link
+        brand = match.group('brand')
+        if brand is None:
+            return match.group(0)
+        program = _AFFILIATE_ALIASES[brand]
+        if counts[program] >= AFFILIATE_LINK_CAP:
+            return brand
+        counts[program] += 1
+        stats[program]['inserted'] += 1
+        return f'[{brand}]({AFFILIATE_LINKS[program]})'
+    
+    return _AFFILIATE_PATTERN.sub(replace, content), stats
+
+
 def insert_affiliate_links(content: str) -> str:
     """Inserta links de afiliados de forma natural en el contenido."""
-    replacements = {
-        r'\bWritesonic\b': f'[Writesonic]({AFFILIATE_LINKS["writesonic"]})',
-        r'\bJasper AI\b': f'[Jasper AI]({AFFILIATE_LINKS["jasper"]})',
-        r'\bJasper\.ai\b': f'[Jasper.ai]({AFFILIATE_LINKS["jasper"]})',
-        r'\bSurfer SEO\b': f'[Surfer SEO]({AFFILIATE_LINKS["surfer_seo"]})',
-        r'\bGrammarly\b': f'[Grammarly]({AFFILIATE_LINKS["grammarly"]})',
-        r'\bCanva\b': f'[Canva]({AFFILIATE_LINKS["canva"]})',
-    }
+    return apply_affiliate_links(content)[0]
+
+
+def relink_post_file(post_file: Path, dry_run: bool = False) -> tuple:
+    """Actualiza los links de afiliados de un post guardado (ejecutable en un worker).
+
+    El archivo solo se reescribe si el contenido cambió, de forma atómica
+    (temporal + rename). Retorna ``(nombre, cambió, stats)``.
+    """
+    with open(post_file, 'r', encoding='utf-8') as f:
+        article = json.load(f)
+    content, stats = apply_affiliate_links(article['content'], rewrite=True)
+    changed = content != article['content']
+    if changed and not dry_run:
+        article['content'] = content
+        article['updated'] = datetime.now(timezone.utc).strftime('%Y-%m-%d')
+        tmp_file = post_file.with_suffix('.tmp')
+        with open(tmp_file, 'w', encoding='utf-8') as f:
+            json.dump(article, f, ensure_ascii=False, indent=2)
+        os.replace(tmp_file, post_file)
+    return post_file.name, changed, stats
+
+
+def relink_posts(jobs: int = 1, dry_run: bool = False) -> dict:
+    """Actualiza los links de afiliados de todos los posts guardados.
+
+    Recorre los JSON de POSTS_DIR (en paralelo con ``jobs`` > 1), reporta
+    los links corregidos/insertados por programa y, si algo cambió,
+    reconstruye el sitio en modo incremental. Retorna los totales por programa.
+    """
+    post_files = sorted(POSTS_DIR.glob("*.json"), reverse=True)
+    print(f"🔗 Relinking affiliate URLs in {len(post_files)} posts...")
     
-    for pattern, replacement in replacements.items():
-        # Solo reemplazar la primera ocurrencia para no saturar
-        content = re.sub(pattern, replacement, content, count=2)
+    totals = {program: {'inserted': 0, 'rewritten': 0} for program in AFFILIATE_LINKS}
+    changed_files = 0
+    for name, changed, stats in run_jobs(partial(relink_post_file, dry_run=dry_run), post_files, jobs):
+        if not changed:
+            continue
+        changed_files += 1
+        if not dry_run:
+            append_post_index(POSTS_DIR / name)
+        print(f"  ✓ Relinked: {name}")
+        for program, counts in stats.items():
+            totals[program]['inserted'] += counts['inserted']
+            totals[program]['rewritten'] += counts['rewritten']
     
-    return content
+    for program, counts in totals.items():
+        if counts['inserted'] or counts['rewritten']:
+            print(f"  {program}: {counts['rewritten']} rewritten, {counts['inserted']} inserted")
+    print(f"\n✅ Relinked {changed_files} of {len(post_files)} posts"
+          + (" (dry run, nothing written)." if dry_run else "."))
+    
+    if changed_files and not dry_run:
+        build_site(incremental=True, jobs=jobs)
+    return totals
 
 
 def markdown_to_html(md_content: str) -> str:
     """Convierte Markdown básico a HTML."""
-    import markdown
-    return markdown.markdown(md_content, extensions=['extra', 'toc', 'codehilite'])
+    return render_markdown(md_content)[0]
 
 
 def save_post(article: dict) -> Path:
@@ -135,333 +352,710 @@ def save_post(article: dict) -> Path:
     post_file = POSTS_DIR / f"{article['date']}-{article['slug']}.json"
     with open(post_file, 'w', encoding='utf-8') as f:
         json.dump(article, f, ensure_ascii=False, indent=2)
+    append_post_index(post_file)
     
     print(f"✓ Post saved: {post_file.name}")
     return post_file
 
 
-def generate_html_post(article: dict) -> str:
-    """Genera el HTML completo de un artículo."""
-    content_html = markdown_to_html(article['content'])
-    tags_html = ' '.join([f'<span class="tag">{tag}</span>' for tag in article.get('tags', [])])
-    
-    return f"""<!DOCTYPE html>
-<html lang="en">
-<head>
-    <meta charset="UTF-8">
-    <meta name="viewport" content="width=device-width, initial-scale=1.0">
-    <title>{article['title']} | {BLOG_TITLE}</title>
-    <meta name="description" content="{article['meta_description']}">
-    <meta name="keywords" content="{', '.join(article.get('tags', []))}">
-    <meta property="og:title" content="{article['title']}">
-    <meta property="og:description" content="{article['meta_description']}">
-    <meta property="og:type" content="article">
-    <meta property="og:url" content="{BLOG_URL}/posts/{article['slug']}.html">
-    <link rel="canonical" href="{BLOG_URL}/posts/{article['slug']}.html">
-    <link rel="stylesheet" href="../static/css/style.css">
-    <!-- Impact Site Verification -->
-    <meta name='impact-site-verification' value='156f1f6b-4545-4796-a756-2851be9ca640'>
-    <!-- Google AdSense -->
-    <script async src="https://pagead2.googlesyndication.com/pagead/js/adsbygoogle.js?client=ca-pub-9333843804849647" crossorigin="anonymous"></script>
-</head>
-<body>
-    <header>
-        <nav>
-            <a href="../index.html" class="logo">{BLOG_TITLE}</a>
-            <ul>
-                <li><a href="../index.html">Home</a></li>
-                <li><a href="../categories/reviews.html">Reviews</a></li>
-                <li><a href="../categories/comparisons.html">Comparisons</a></li>
-                <li><a href="../categories/guides.html">Guides</a></li>
-            </ul>
-        </nav>
-    </header>
-    
-    <main class="article-container">
-        <article>
-            <header class="article-header">
-                <div class="article-meta">
-                    <span class="category">{article['category']}</span>
-                    <span class="date">{article['date']}</span>
-                    <span class="read-time">⏱ {article.get('estimated_read_time', 6)} min read</span>
-                </div>
-                <h1>{article['title']}</h1>
-                <p class="article-description">{article['meta_description']}</p>
-                <div class="tags">{tags_html}</div>
-            </header>
-            
-            <!-- Ad placeholder (top) -->
-            <div class="ad-container ad-top">
-                <ins class="adsbygoogle"
-                     style="display:block"
-                     data-ad-client="ca-pub-9333843804849647"
-                     data-ad-slot="auto"
-                     data-ad-format="auto"
-                     data-full-width-responsive="true"></ins>
-                <script>(adsbygoogle = window.adsbygoogle || []).push({{}});</script>
-            </div>
-            
-            <div class="article-content">
-                {content_html}
-            </div>
-            
-            <!-- Ad placeholder (middle) -->
-            <div class="ad-container ad-middle">
-                <ins class="adsbygoogle"
-                     style="display:block"
-                     data-ad-client="ca-pub-9333843804849647"
-                     data-ad-slot="auto"
-                     data-ad-format="auto"
-                     data-full-width-responsive="true"></ins>
-                <script>(adsbygoogle = window.adsbygoogle || []).push({{}});</script>
-            </div>
-            
-            <footer class="article-footer">
-                <div class="author-bio">
-                    <h3>About {BLOG_AUTHOR}</h3>
-                    <p>We test and review the latest AI tools to help freelancers and small businesses make informed decisions. Our reviews are honest, thorough, and based on real-world usage.</p>
-                </div>
-                <div class="tags">{tags_html}</div>
-            </footer>
-        </article>
-        
-        <!-- Sidebar -->
-        <aside class="sidebar">
-            <div class="sidebar-widget">
-                <h3>Top AI Writing Tools</h3>
-                <ul class="tool-list">
-                    <li><a href="{AFFILIATE_LINKS['writesonic']}" target="_blank" rel="nofollow">🤖 Writesonic - Best for Blogs</a></li>
-                    <li><a href="{AFFILIATE_LINKS['jasper']}" target="_blank" rel="nofollow">✍️ Jasper AI - Best for Marketing</a></li>
-                    <li><a href="{AFFILIATE_LINKS['grammarly']}" target="_blank" rel="nofollow">📝 Grammarly - Best for Editing</a></li>
-                    <li><a href="{AFFILIATE_LINKS['surfer_seo']}" target="_blank" rel="nofollow">🔍 Surfer SEO - Best for SEO</a></li>
-                </ul>
-            </div>
-            <div class="sidebar-widget">
-                <h3>Popular Posts</h3>
-                <div id="popular-posts">Loading...</div>
-            </div>
-        </aside>
-    </main>
-    
-    <footer class="site-footer">
-        <div class="footer-content">
-            <p>&copy; 2026 {BLOG_TITLE}. All rights reserved.</p>
-            <p><small>Some links on this site are affiliate links. We may earn a commission at no extra cost to you.</small></p>
-            <nav>
-                <a href="../about.html">About</a> |
-                <a href="../privacy.html">Privacy Policy</a> |
-                <a href="../disclaimer.html">Affiliate Disclaimer</a>
-            </nav>
-        </div>
-    </footer>
-    
-    <script src="../static/js/main.js"></script>
-</body>
-</html>"""
+# ============================================================
+# ÍNDICE DE POSTS (metadatos sin el campo 'content')
+# ============================================================
+_post_index_lock = threading.Lock()
+
+
+def load_post(name: str) -> dict:
+    """Carga el JSON completo de un post guardado en POSTS_DIR."""
+    with open(POSTS_DIR / name, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+def _post_index_entry(post_file: Path) -> dict:
+    """Construye la entrada del índice para un post (metadatos + tamaño y hash del archivo).
+
+    Incluye la firma MinHash del contenido (near_duplicates), para detectar
+    artículos casi duplicados sin volver a leer cada post.
+    """
+    data = post_file.read_bytes()
+    post = json.loads(data)
+    entry = {'file': post_file.name, 'size': len(data), 'source_hash': _hash_bytes(data)}
+    entry.update({field: post[field] for field in POST_INDEX_FIELDS if field in post})
+    entry['minhash'] = encode_signature(minhash(content_shingles(post.get('content', ''))))
+    return entry
+
+
+def append_post_index(post_file: Path):
+    """Agrega (o reemplaza) la entrada de un post al final del índice.
+
+    Se llama cada vez que se escribe un post (save_post, relink). El índice
+    es append-only: si un archivo aparece varias veces gana la última línea,
+    y load_post_index() lo compacta al leerlo.
+    """
+    line = json.dumps(_post_index_entry(post_file), ensure_ascii=False)
+    with _post_index_lock:
+        with open(POST_INDEX_FILE, 'a', encoding='utf-8') as f:
+            f.write(line + "\n")
+
+
+def _write_post_index(entries: list):
+    """Reescribe el índice completo de forma atómica."""
+    tmp_file = POST_INDEX_FILE.with_suffix('.tmp')
+    with open(tmp_file, 'w', encoding='utf-8') as f:
+        for entry in entries:
+            f.write(json.dumps(entry, ensure_ascii=False) + "\n")
+    os.replace(tmp_file, POST_INDEX_FILE)
+
+
+def _load_post_index_stat() -> dict:
+    try:
+        with open(POST_INDEX_STAT_FILE, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def _save_post_index_stat(stat: dict):
+    POST_INDEX_STAT_FILE.parent.mkdir(parents=True, exist_ok=True)
+    tmp_file = POST_INDEX_STAT_FILE.with_suffix('.tmp')
+    with open(tmp_file, 'w', encoding='utf-8') as f:
+        json.dump(stat, f)
+    os.replace(tmp_file, POST_INDEX_STAT_FILE)
+
+
+def load_post_index() -> list:
+    """Retorna los metadatos de todos los posts, del más reciente al más antiguo.
+
+    Un post con el mismo tamaño y mtime que la última vez no se vuelve a
+    leer; si cambiaron se compara el hash del archivo con ``source_hash`` y
+    solo se re-indexa si el contenido cambió. El índice se reescribe
+    compactado si hubo cambios.
+    """
+    indexed = {}
+    lines = 0
+    if POST_INDEX_FILE.exists():
+        with open(POST_INDEX_FILE, 'r', encoding='utf-8') as f:
+            for line in f:
+                if line.strip():
+                    entry = json.loads(line)
+                    indexed[entry['file']] = entry
+                    lines += 1
+    previous_stat = _load_post_index_stat()
+    
+    entries = []
+    stat = {}
+    dirty = lines != len(indexed)
+    for post_file in sorted(POSTS_DIR.glob("*.json"), reverse=True):
+        entry = indexed.pop(post_file.name, None)
+        file_stat = post_file.stat()
+        stat[post_file.name] = [file_stat.st_size, file_stat.st_mtime_ns]
+        if entry is None or 'minhash' not in entry or 'source_hash' not in entry:
+            stale = True
+        elif previous_stat.get(post_file.name) == stat[post_file.name]:
+            stale = False
+        else:
+            stale = _hash_bytes(post_file.read_bytes()) != entry['source_hash']
+        if stale:
+            entry = _post_index_entry(post_file)
+            dirty = True
+        entries.append(entry)
+    
+    if dirty or indexed:
+        with _post_index_lock:
+            _write_post_index(entries)
+    if stat != previous_stat:
+        _save_post_index_stat(stat)
+    return entries
+
+
+# ============================================================
+# PLANTILLAS HTML (templates/)
+# ============================================================
+def _site_context() -> dict:
+    """Valores comunes a todas las páginas (configuración y partials fijos)."""
+    context = {
+        'blog_title': BLOG_TITLE,
+        'blog_tagline': BLOG_TAGLINE,
+        'blog_description': BLOG_DESCRIPTION,
+        'blog_url': BLOG_URL,
+        'blog_author': BLOG_AUTHOR,
+    }
+    context.update({f'affiliate_{program}': url for program, url in AFFILIATE_LINKS.items()})
+    context.update(asset_urls())
+    ad_slot = get_template("partials/ad_slot.html")
+    for ad_class in ('ad-top', 'ad-middle', 'ad-banner'):
+        context[ad_class.replace('-', '_')] = ad_slot.render(ad_class=ad_class)
+    return context
+
+
+@lru_cache(maxsize=None)
+def page_template(name: str, root: str = "") -> Template:
+    """Retorna una plantilla de página con la configuración del sitio ya resuelta.
+
+    ``root`` es el prefijo relativo hasta la raíz del sitio ("../" para las
+    páginas dentro de posts/ o categories/).
+    """
+    return get_template(name).bind(root=root, **_site_context())
+
+
+def render_static_page(title: str, meta_description: str, body: str) -> str:
+    """Genera una página estática (About, Privacy...) con el layout del sitio."""
+    return page_template("page.html").render(
+        title=title,
+        meta_description=meta_description,
+        body=body,
+    )
+
+
+def generate_static_pages() -> dict:
+    """Genera las páginas estáticas de STATIC_PAGES; retorna ``{ruta: html}``."""
+    return {
+        rel_path: render_static_page(title, meta_description, get_template(f"pages/{rel_path}").render())
+        for rel_path, (title, meta_description) in STATIC_PAGES.items()
+    }
+
+
+def _tags_html(tags: list, css_class: str = "tag") -> str:
+    return ' '.join([f'<span class="{css_class}">{tag}</span>' for tag in tags])
+
+
+def _related_posts_html(related: list) -> str:
+    """Lista de artículos relacionados ``[(título, slug), ...]`` para la barra lateral."""
+    if not related:
+        return '<p class="related-empty">More articles coming soon.</p>'
+    items = '\n'.join([
+        f'<li><a href="{slug}.html">{title}</a></li>'
+        for title, slug in related
+    ])
+    return f'<ul class="related-posts">\n{items}\n</ul>'
+
+
+def _toc_items(tokens: list) -> list:
+    return [token for token in tokens if token['level'] <= TOC_MAX_LEVEL]
+
+
+def _toc_list_html(tokens: list) -> str:
+    items = []
+    for token in _toc_items(tokens):
+        children = _toc_items(token['children'])
+        nested = _toc_list_html(children) if children else ''
+        items.append(f'<li><a href="#{token["id"]}">{token["name"]}</a>{nested}</li>')
+    return '<ul>' + ''.join(items) + '</ul>'
+
+
+def _toc_html(tokens: list) -> str:
+    """Tabla de contenidos de un artículo a partir de los ``toc_tokens`` de Markdown.
+
+    Los links apuntan a los ids que la extensión ``toc`` ya puso en cada
+    encabezado, así que son estables mientras no cambie el texto.
+    """
+    def count(tokens):
+        return sum(1 + count(token['children']) for token in _toc_items(tokens))
+    if count(tokens) < TOC_MIN_HEADINGS:
+        return ''
+    return f'<div class="toc-container"><h4>📋 Table of Contents</h4>{_toc_list_html(tokens)}</div>'
+
+
+def generate_html_post(article: dict, related: list = ()) -> str:
+    """Genera el HTML completo de un artículo.
+
+    ``related`` son los artículos relacionados ``[(título, slug), ...]``
+    precalculados por ``related_posts`` para la barra lateral.
+    """
+    tags = article.get('tags', [])
+    content_html, toc_tokens = render_markdown(article['content'])
+    return page_template("post.html", "../").render(
+        title=article['title'],
+        meta_description=article['meta_description'],
+        keywords=', '.join(tags),
+        slug=article['slug'],
+        category=article['category'],
+        date=article['date'],
+        read_time=article.get('estimated_read_time', 6),
+        tags_html=_tags_html(tags),
+        toc_html=_toc_html(toc_tokens),
+        content_html=content_html,
+        related_html=_related_posts_html(related),
+    )
+
+
+_POST_CARD_COLUMNS = ('category', 'slug', 'title', 'meta_description', 'date', 'read_time', 'tags_html')
+
+
+def _post_cards_html(posts: list, root: str = "") -> str:
+    """Genera las tarjetas de una lista de posts (homepage y listados)."""
+    card = page_template("partials/post_card.html", root)
+    return card.render_rows(_POST_CARD_COLUMNS, [(
+        post.get('category', 'AI Tools'),
+        post['slug'],
+        post['title'],
+        post['meta_description'],
+        post['date'],
+        post.get('estimated_read_time', 6),
+        ' '.join([f'<span class="tag-small">{tag}</span>' for tag in post.get('tags', [])[:3]]),
+    ) for post in posts])
 
 
 def generate_homepage(posts: list) -> str:
     """Genera la página principal del blog."""
-    posts_html = ""
-    for post in posts[:12]:  # Mostrar los últimos 12 artículos
-        tags_preview = ' '.join([f'<span class="tag-small">{t}</span>' for t in post.get('tags', [])[:3]])
-        posts_html += f"""
-        <article class="post-card">
-            <div class="post-card-content">
-                <span class="post-category">{post.get('category', 'AI Tools')}</span>
-                <h2><a href="posts/{post['slug']}.html">{post['title']}</a></h2>
-                <p class="post-excerpt">{post['meta_description']}</p>
-                <div class="post-meta">
-                    <span class="post-date">{post['date']}</span>
-                    <span class="post-read-time">⏱ {post.get('estimated_read_time', 6)} min</span>
-                </div>
-                <div class="post-tags">{tags_preview}</div>
-                <a href="posts/{post['slug']}.html" class="read-more">Read More →</a>
-            </div>
-        </article>"""
-    
-    return f"""<!DOCTYPE html>
-<html lang="en">
-<head>
-    <meta charset="UTF-8">
-    <meta name="viewport" content="width=device-width, initial-scale=1.0">
-    <title>{BLOG_TITLE} - {BLOG_TAGLINE}</title>
-    <meta name="description" content="{BLOG_DESCRIPTION}">
-    <meta property="og:title" content="{BLOG_TITLE}">
-    <meta property="og:description" content="{BLOG_DESCRIPTION}">
-    <meta property="og:type" content="website">
-    <link rel="canonical" href="{BLOG_URL}">
-    <link rel="stylesheet" href="static/css/style.css">
-    <!-- Impact Site Verification -->
-    <meta name='impact-site-verification' value='156f1f6b-4545-4796-a756-2851be9ca640'>
-    <!-- Google AdSense -->
-    <script async src="https://pagead2.googlesyndication.com/pagead/js/adsbygoogle.js?client=ca-pub-9333843804849647" crossorigin="anonymous"></script>
-</head>
-<body>
-    <header>
-        <nav>
-            <a href="index.html" class="logo">{BLOG_TITLE}</a>
-            <ul>
-                <li><a href="index.html">Home</a></li>
-                <li><a href="categories/reviews.html">Reviews</a></li>
-                <li><a href="categories/comparisons.html">Comparisons</a></li>
-                <li><a href="categories/guides.html">Guides</a></li>
-            </ul>
-        </nav>
-    </header>
-    
-    <section class="hero">
-        <div class="hero-content">
-            <h1>{BLOG_TITLE}</h1>
-            <p>{BLOG_TAGLINE}</p>
-            <p class="hero-sub">Helping freelancers and small businesses choose the right AI tools to save time and grow faster.</p>
-        </div>
-    </section>
-    
-    <!-- Top Ad Banner -->
-    <div class="ad-container ad-banner">
-        <ins class="adsbygoogle"
-             style="display:block"
-             data-ad-client="ca-pub-9333843804849647"
-             data-ad-slot="auto"
-             data-ad-format="auto"
-             data-full-width-responsive="true"></ins>
-        <script>(adsbygoogle = window.adsbygoogle || []).push({{}});</script>
-    </div>
-    
-    <main class="homepage-main">
-        <section class="featured-tools">
-            <h2>🏆 Top Recommended AI Tools</h2>
-            <div class="tools-grid">
-                <a href="{AFFILIATE_LINKS['writesonic']}" target="_blank" rel="nofollow" class="tool-card">
-                    <h3>Writesonic</h3>
-                    <p>Best AI writing tool for blogs & content</p>
-                    <span class="cta-btn">Try Free →</span>
-                </a>
-                <a href="{AFFILIATE_LINKS['jasper']}" target="_blank" rel="nofollow" class="tool-card">
-                    <h3>Jasper AI</h3>
-                    <p>Best for marketing copy & long-form content</p>
-                    <span class="cta-btn">Try Free →</span>
-                </a>
-                <a href="{AFFILIATE_LINKS['surfer_seo']}" target="_blank" rel="nofollow" class="tool-card">
-                    <h3>Surfer SEO</h3>
-                    <p>Best AI-powered SEO optimization tool</p>
-                    <span class="cta-btn">Try Free →</span>
-                </a>
-                <a href="{AFFILIATE_LINKS['grammarly']}" target="_blank" rel="nofollow" class="tool-card">
-                    <h3>Grammarly</h3>
-                    <p>Best AI writing assistant & grammar checker</p>
-                    <span class="cta-btn">Try Free →</span>
-                </a>
-            </div>
-        </section>
-        
-        <section class="latest-posts">
-            <h2>Latest Articles</h2>
-            <div class="posts-grid">
-                {posts_html}
-            </div>
-        </section>
-    </main>
-    
-    <footer class="site-footer">
-        <div class="footer-content">
-            <p>&copy; 2026 {BLOG_TITLE}. All rights reserved.</p>
-            <p><small>Some links on this site are affiliate links. We may earn a small commission at no extra cost to you. <a href="disclaimer.html">Read our affiliate disclaimer.</a></small></p>
-            <nav>
-                <a href="about.html">About</a> |
-                <a href="privacy.html">Privacy Policy</a> |
-                <a href="disclaimer.html">Affiliate Disclaimer</a> |
-                <a href="sitemap.xml">Sitemap</a>
-            </nav>
-        </div>
-    </footer>
-    
-    <script src="static/js/main.js"></script>
-</body>
-</html>"""
-
-
-def generate_sitemap(posts: list) -> str:
-    """Genera el sitemap XML para SEO."""
-    urls = f"""<?xml version="1.0" encoding="UTF-8"?>
-<urlset xmlns="http://www.sitemaps.org/schemas/sitemap/0.9">
-    <url>
-        <loc>{BLOG_URL}/index.html</loc>
-        <changefreq>daily</changefreq>
-        <priority>1.0</priority>
-    </url>"""
+    posts_html = _post_cards_html(posts[:12])  # Mostrar los últimos 12 artículos
+    return page_template("home.html").render(posts_html=posts_html)
+
+
+def category_slug(category: str) -> str:
+    """Nombre de archivo base de una categoría (``Reviews`` -> ``reviews``)."""
+    return generate_slug(category)
+
+
+def paginate_listing(posts: list, page_size: int = CATEGORY_PAGE_SIZE) -> list:
+    """Divide un listado (del más nuevo al más antiguo) en páginas de archivo.
+
+    Las páginas se numeran desde los posts más antiguos: la página 1 contiene
+    los ``page_size`` primeros publicados y solo la última página está
+    incompleta. Así, publicar un post nuevo solo cambia la última página (o
+    crea una nueva) en lugar de desplazar todo el archivo. Retorna una lista
+    de páginas, cada una con sus posts del más nuevo al más antiguo.
+    """
+    oldest_first = posts[::-1]
+    return [
+        oldest_first[start:start + page_size][::-1]
+        for start in range(0, len(oldest_first), page_size)
+    ]
+
+
+def generate_listing_pages(name: str, slug: str, posts: list,
+                           page_size: int = CATEGORY_PAGE_SIZE) -> dict:
+    """Genera la portada y las páginas de archivo de un listado.
+
+    La portada ``categories/{slug}.html`` muestra los ``page_size`` posts
+    más recientes; las páginas ``categories/{slug}-page-{n}.html`` contienen
+    el archivo completo paginado con paginate_listing(). Retorna un dict
+    {ruta relativa a OUTPUT_DIR: html}.
+    """
+    template = page_template("listing.html", "../")
+    chunks = paginate_listing(posts, page_size)
+    last = len(chunks)
+    
+    def page_url(number: int) -> str:
+        return f"{slug}.html" if number > last else f"{slug}-page-{number}.html"
+    
+    def pagination(newer: int | None, older: int | None) -> str:
+        links = []
+        if newer:
+            links.append(f'<a href="{page_url(newer)}" class="pagination-newer">← Newer posts</a>')
+        if older:
+            links.append(f'<a href="{page_url(older)}" class="pagination-older">Older posts →</a>')
+        return f'<nav class="pagination">{"".join(links)}</nav>' if links else ''
     
+    pages = {
+        f"categories/{slug}.html": template.render(
+            title=name,
+            heading=name,
+            posts_html=_post_cards_html(posts[:page_size], "../"),
+            pagination_html=pagination(None, last - 1 if last > 1 else None),
+        )
+    }
+    for number, chunk in enumerate(chunks, 1):
+        pages[f"categories/{page_url(number)}"] = template.render(
+            title=f"{name} - Page {number}",
+            heading=f"{name} - Page {number}",
+            posts_html=_post_cards_html(chunk, "../"),
+            pagination_html=pagination(number + 1, number - 1 if number > 1 else None),
+        )
+    return pages
+
+
+def site_listings(posts: list) -> list:
+    """Retorna los listados del sitio: ``(nombre, slug, posts)`` por categoría + archivo."""
+    categories = {name: [] for name in NAV_CATEGORIES}
+    for post in posts:
+        categories.setdefault(post.get('category', 'AI Tools'), []).append(post)
+    listings = [(name, category_slug(name), items) for name, items in categories.items()]
+    listings.append(("All Articles", "archive", posts))
+    return listings
+
+
+def post_lastmod(post: dict) -> str:
+    """Fecha de última modificación de un post (``updated`` o fecha de publicación)."""
+    return post.get('updated') or post['date']
+
+
+def write_sitemaps(posts: list):
+    """Escribe los sitemaps del sitio en streaming (shards + sitemap-index.xml).
+
+    Incluye la homepage, la portada de cada listado y todos los posts, con
+    ``lastmod`` tomado de la última actualización de cada post.
+    """
+    with SitemapWriter(OUTPUT_DIR, BLOG_URL) as writer:
+        newest = max((post_lastmod(post) for post in posts), default=None)
+        writer.add(f"{BLOG_URL}/index.html", newest, "daily", "1.0")
+        for name, slug, listing in site_listings(posts):
+            listing_lastmod = max((post_lastmod(post) for post in listing), default=None)
+            writer.add(f"{BLOG_URL}/categories/{slug}.html", listing_lastmod, "daily", "0.6")
+        for post in posts:
+            writer.add(f"{BLOG_URL}/posts/{post['slug']}.html", post_lastmod(post), "monthly", "0.8")
+    writer.remove_stale_shards()
+    return writer.shards
+
+
+def write_robots_txt():
+    """Escribe robots.txt apuntando al índice de sitemaps."""
+    robots_txt = f"""User-agent: *
+Allow: /
+
+Sitemap: {BLOG_URL}/{SITEMAP_INDEX_NAME}
+"""
+    path = OUTPUT_DIR / "robots.txt"
+    if not path.exists() or path.read_text(encoding='utf-8') != robots_txt:
+        path.write_text(robots_txt, encoding='utf-8')
+        print("  ✓ Generated: robots.txt")
+
+
+def _hash_bytes(data: bytes) -> str:
+    """Retorna el hash SHA-256 (hex) de un bloque de bytes."""
+    return hashlib.sha256(data).hexdigest()
+
+
+def _build_config_hash() -> str:
+    """Hash de todo lo que afecta al HTML de un post además de su JSON.
+
+    Incluye el código del generador (configuración y AFFILIATE_LINKS viven
+    en este archivo), el del render de Markdown (markdown_render.py, con sus
+    extensiones y las versiones de Markdown y Pygments), el del post-proceso
+    del HTML (assets.py y critical_css.py), las plantillas de templates/ y
+    los nombres con hash de los assets, así que cualquier cambio de layout,
+    de links, de Markdown, de minificación o de CSS/JS invalida todos los
+    posts en el siguiente build.
+    """
+    data = (Path(__file__).read_bytes() + (_BASE_DIR / "markdown_render.py").read_bytes()
+            + markdown_fingerprint().encode() + (_BASE_DIR / "assets.py").read_bytes()
+            + (_BASE_DIR / "critical_css.py").read_bytes()
+            + templates_fingerprint() + assets_fingerprint()
+            + str(BUILD_MANIFEST_VERSION).encode())
+    return _hash_bytes(data)
+
+
+def load_build_manifest() -> dict:
+    """Carga el manifest del último build (vacío si no existe o es inválido)."""
+    try:
+        with open(BUILD_MANIFEST_FILE, 'r', encoding='utf-8') as f:
+            manifest = json.load(f)
+    except (OSError, ValueError):
+        return {}
+    if manifest.get('version') != BUILD_MANIFEST_VERSION:
+        return {}
+    return manifest
+
+
+def save_build_manifest(manifest: dict):
+    """Guarda el manifest de forma atómica (escribe a un temporal y renombra)."""
+    tmp_file = BUILD_MANIFEST_FILE.with_suffix('.tmp')
+    with open(tmp_file, 'w', encoding='utf-8') as f:
+        json.dump(manifest, f, ensure_ascii=False, indent=2, sort_keys=True)
+    os.replace(tmp_file, BUILD_MANIFEST_FILE)
+
+
+def feed_slug(listing_slug: str) -> str:
+    """Nombre de archivo del feed de un listado (el archivo completo es ``all``)."""
+    return "all" if listing_slug == "archive" else listing_slug
+
+
+def _feed_entries(posts: list, full_content: bool):
+    """Genera las entradas de un feed cargando cada artículo completo de a uno."""
     for post in posts:
-        urls += f"""
-    <url>
-        <loc>{BLOG_URL}/posts/{post['slug']}.html</loc>
-        <lastmod>{post['date']}</lastmod>
-        <changefreq>monthly</changefreq>
-        <priority>0.8</priority>
-    </url>"""
+        entry = {
+            'title': post['title'],
+            'link': f"{BLOG_URL}/posts/{post['slug']}.html",
+            'summary': post['meta_description'],
+            'date': post['date'],
+            'updated': post_lastmod(post),
+            'categories': [post.get('category', 'AI Tools')] + list(post.get('tags', [])),
+        }
+        if full_content:
+            entry['content_html'] = markdown_to_html(load_post(post['file'])['content'])
+        yield entry
+
+
+def write_feeds(posts: list, sources: dict, config_hash: str, previous_feeds: dict) -> dict:
+    """Escribe los feeds RSS y Atom del sitio y de cada categoría.
+
+    Cada feed tiene una firma calculada desde el índice (archivo y hash del
+    contenido de sus FEED_SIZE posts más recientes, tomado de ``sources`` +
+    configuración); si coincide con la del build anterior el feed no se
+    regenera ni se carga ningún post. La firma no depende del mtime, así que
+    un checkout nuevo no regenera los feeds. Retorna las firmas actuales
+    para guardarlas en el manifest.
+    """
+    feeds = {}
+    for name, slug, listing in site_listings(posts):
+        slug = feed_slug(slug)
+        newest = listing[:FEED_SIZE]
+        signature = _hash_bytes(json.dumps([
+            config_hash, FEED_FULL_CONTENT,
+            [(post['file'], sources[post['file']]['source_hash']) for post in newest],
+        ]).encode('utf-8'))
+        feeds[slug] = signature
+        rss_path = OUTPUT_DIR / "feeds" / f"{slug}.rss.xml"
+        atom_path = OUTPUT_DIR / "feeds" / f"{slug}.atom.xml"
+        if previous_feeds.get(slug) == signature and rss_path.exists() and atom_path.exists():
+            continue
+        
+        title = BLOG_TITLE if slug == "all" else f"{name} | {BLOG_TITLE}"
+        link = f"{BLOG_URL}/index.html" if slug == "all" else f"{BLOG_URL}/categories/{slug}.html"
+        updated = max((post_lastmod(post) for post in newest), default=None)
+        with RssWriter(rss_path, title, link, BLOG_DESCRIPTION,
+                       f"{BLOG_URL}/feeds/{rss_path.name}", updated) as rss, \
+                AtomWriter(atom_path, title, link, BLOG_DESCRIPTION,
+                           f"{BLOG_URL}/feeds/{atom_path.name}", updated, BLOG_AUTHOR) as atom:
+            for entry in _feed_entries(newest, FEED_FULL_CONTENT):
+                rss.add(entry)
+                atom.add(entry)
+        print(f"  ✓ Generated: feeds/{slug}.rss.xml + {slug}.atom.xml")
     
-    urls += "\n</urlset>"
-    return urls
+    for slug in previous_feeds.keys() - feeds.keys():
+        for suffix in ('rss.xml', 'atom.xml'):
+            (OUTPUT_DIR / "feeds" / f"{slug}.{suffix}").unlink(missing_ok=True)
+    return feeds
+
+
+def page_changed(rel_path: str, content: str, config_hash: str,
+                 previous_pages: dict, pages: dict) -> bool:
+    """Indica si una página de OUTPUT_DIR cambió desde el último build.
+
+    Registra en ``pages`` (que se guarda en el manifest) el hash del
+    contenido sin minificar junto con el de la configuración, así un cambio
+    del generador o del minificador también reescribe la página.
+    """
+    content_hash = _hash_bytes(config_hash.encode() + content.encode('utf-8'))
+    pages[rel_path] = content_hash
+    return previous_pages.get(rel_path) != content_hash or not (OUTPUT_DIR / rel_path).exists()
+
+
+def write_page(path: Path, html: str) -> tuple:
+    """Escribe una página HTML (con su CSS crítico incrustado y minificada)
+    junto con sus variantes ``.gz``/``.br``.
+
+    Retorna ``(bytes sin minificar, bytes escritos)``.
+    """
+    if INLINE_CRITICAL_CSS:
+        html = inline_critical_css(html)
+    original = html.encode('utf-8')
+    data = minify_html(html).encode('utf-8') if MINIFY_HTML else original
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_bytes(data)
+    write_precompressed(path, data)
+    return len(original), len(data)
+
+
+def _size_change(original: int, written: int) -> str:
+    return f"{original / 1024:.1f} KB → {written / 1024:.1f} KB"
+
+
+def _write_post_page(job: tuple) -> tuple:
+    """Carga, renderiza y escribe la página de un post (ejecutable en un worker).
+
+    Retorna ``(slug, bytes sin minificar, bytes escritos)``.
+    """
+    post_file, post_path, related = job
+    with open(post_file, 'r', encoding='utf-8') as f:
+        post = json.load(f)
+    return (post['slug'], *write_page(post_path, generate_html_post(post, related)))
+
+
+def _write_output_page(job: tuple) -> tuple:
+    """Escribe una página ya renderizada de OUTPUT_DIR (ejecutable en un worker)."""
+    rel_path, html = job
+    return (rel_path, *write_page(OUTPUT_DIR / rel_path, html))
+
 
+def run_jobs(function, jobs_list: list, jobs: int = 1):
+    """Aplica ``function`` a cada trabajo en serie o repartido en un pool de procesos.
 
-def build_site():
-    """Construye el sitio completo desde los posts guardados."""
+    Los resultados se entregan en el mismo orden que ``jobs_list`` para que
+    la salida por consola sea determinista sin importar el número de workers.
+    """
+    if jobs <= 1 or len(jobs_list) <= 1:
+        yield from map(function, jobs_list)
+        return
+    chunksize = max(1, len(jobs_list) // (jobs * 4))
+    with ProcessPoolExecutor(max_workers=jobs) as executor:
+        yield from executor.map(function, jobs_list, chunksize=chunksize)
+
+
+def build_site(incremental: bool = False, jobs: int = 1):
+    """Construye el sitio completo desde los posts guardados.
+
+    Con ``incremental=True`` solo se re-renderizan los posts cuyo JSON cambió
+    (o cuyo HTML falta) desde el último build; las páginas agregadas
+    (homepage, categorías y sitemap) se calculan a partir del índice de
+    posts y solo se reescriben las páginas cuyo contenido cambió.
+    ``jobs`` > 1 reparte el render de los posts (Markdown + HTML) y la
+    minificación y compresión de las páginas que cambiaron entre varios
+    procesos.
+    """
     OUTPUT_DIR.mkdir(exist_ok=True)
     (OUTPUT_DIR / "posts").mkdir(exist_ok=True)
-    (OUTPUT_DIR / "static" / "css").mkdir(parents=True, exist_ok=True)
-    (OUTPUT_DIR / "static" / "js").mkdir(parents=True, exist_ok=True)
     (OUTPUT_DIR / "categories").mkdir(exist_ok=True)
     
-    # Cargar todos los posts
-    posts = []
-    for post_file in sorted(POSTS_DIR.glob("*.json"), reverse=True):
-        with open(post_file, 'r', encoding='utf-8') as f:
-            posts.append(json.load(f))
+    config_hash = _build_config_hash()
+    previous = load_build_manifest()
+    previous_posts = previous.get('posts', {})
+    if incremental and previous.get('config_hash') != config_hash:
+        print("Generator or configuration changed, rebuilding all posts...")
+        incremental = False
+    
+    # Cargar los metadatos de todos los posts
+    posts = load_post_index()
     
     print(f"Building site with {len(posts)} posts...")
     
-    # Generar páginas de artículos
+    # Artículos relacionados (solo se recalculan las filas de los posts nuevos o modificados)
+    related_state, related_stats = update_related_posts(
+        posts, previous.get('related', {}), RELATED_POSTS_COUNT
+    )
+    if related_stats['recomputed']:
+        scope = "full rebuild" if related_stats['full'] else "incremental"
+        print(f"  ✓ Related posts: {related_stats['recomputed']} posts recomputed ({scope})")
+    by_file = {post['file']: post for post in posts}
+    
+    # Generar páginas de artículos (el JSON completo solo se lee si hay que renderizar)
+    sources = {}
+    pending = []
+    skipped = 0
     for post in posts:
-        html = generate_html_post(post)
-        post_path = OUTPUT_DIR / "posts" / f"{post['slug']}.html"
-        with open(post_path, 'w', encoding='utf-8') as f:
-            f.write(html)
-        print(f"  ✓ Generated: {post['slug']}.html")
-    
-    # Generar homepage
-    homepage = generate_homepage(posts)
-    with open(OUTPUT_DIR / "index.html", 'w', encoding='utf-8') as f:
-        f.write(homepage)
-    print("  ✓ Generated: index.html")
-    
-    # Generar sitemap
-    sitemap = generate_sitemap(posts)
-    with open(OUTPUT_DIR / "sitemap.xml", 'w', encoding='utf-8') as f:
-        f.write(sitemap)
-    print("  ✓ Generated: sitemap.xml")
-    
-    # Copiar CSS y JS
-    copy_assets()
+        post_file = POSTS_DIR / post['file']
+        prev = previous_posts.get(post['file'], {})
+        source_hash = post['source_hash']  # Calculado al indexar, sin volver a leer el archivo
+        related = [
+            (by_file[other]['title'], by_file[other]['slug'])
+            for other, _ in related_state['links'].get(post['file'], [])
+        ]
+        entry = {
+            'source_hash': source_hash,
+            'output': f"posts/{post['slug']}.html",
+            'related': _hash_bytes(json.dumps(related, ensure_ascii=False).encode('utf-8')),
+        }
+        sources[post['file']] = entry
+        
+        post_path = OUTPUT_DIR / entry['output']
+        unchanged = (prev.get('source_hash') == source_hash
+                     and prev.get('output') == entry['output']
+                     and prev.get('related') == entry['related'])
+        if incremental and unchanged and post_path.exists():
+            skipped += 1
+            continue
+        pending.append((post_file, post_path, related))
+    html_stats = [0, 0, 0]  # páginas, bytes sin minificar, bytes escritos
+    for slug, original, written in run_jobs(_write_post_page, pending, jobs):
+        print(f"  ✓ Generated: {slug}.html ({_size_change(original, written)})")
+        html_stats[0] += 1
+        html_stats[1] += original
+        html_stats[2] += written
+    if skipped:
+        print(f"  ↷ Unchanged: {skipped} posts skipped")
+    
+    # Eliminar el HTML de posts que ya no existen
+    current_outputs = {entry['output'] for entry in sources.values()}
+    for entry in previous_posts.values():
+        stale = OUTPUT_DIR / entry['output']
+        if entry['output'] not in current_outputs and stale.exists():
+            remove_published(stale)
+            print(f"  ✗ Removed: {stale.name}")
+    
+    # Generar homepage, páginas estáticas y listados (solo se reescriben las
+    # páginas que cambian; todas referencian los CSS/JS con hash publicados abajo)
+    previous_pages = previous.get('pages', {})
+    pages = {}
+    changed_pages = []
+    top_pages = {"index.html": generate_homepage(posts), **generate_static_pages()}
+    changed_pages.extend(
+        (rel_path, html)
+        for rel_path, html in top_pages.items()
+        if page_changed(rel_path, html, config_hash, previous_pages, pages)
+    )
+    for name, slug, listing in site_listings(posts):
+        changed_pages.extend(
+            (rel_path, html)
+            for rel_path, html in generate_listing_pages(name, slug, listing).items()
+            if page_changed(rel_path, html, config_hash, previous_pages, pages)
+        )
+    for rel_path, original, written in run_jobs(_write_output_page, changed_pages, jobs):
+        print(f"  ✓ Generated: {rel_path} ({_size_change(original, written)})")
+        html_stats[0] += 1
+        html_stats[1] += original
+        html_stats[2] += written
+    for rel_path in previous_pages.keys() - pages.keys():
+        stale = OUTPUT_DIR / rel_path
+        if stale.exists():
+            remove_published(stale)
+            print(f"  ✗ Removed: {rel_path}")
+    if html_stats[0] and MINIFY_HTML:
+        print(f"  ✓ Minified {html_stats[0]} HTML pages: "
+              f"{(html_stats[1] - html_stats[2]) / 1024:.1f} KB saved ({_size_change(*html_stats[1:])})")
+    
+    # Generar sitemaps (el sitemap.xml único de versiones anteriores se reemplaza por el índice)
+    shards = write_sitemaps(posts)
+    (OUTPUT_DIR / "sitemap.xml").unlink(missing_ok=True)
+    print(f"  ✓ Generated: {SITEMAP_INDEX_NAME} ({len(shards)} sitemap files)")
+    write_robots_txt()
+    
+    # Generar feeds RSS/Atom (solo si cambió el conjunto de posts más recientes)
+    feeds = write_feeds(posts, sources, config_hash, previous.get('feeds', {}))
+    
+    # Actualizar el índice de búsqueda (solo se tokenizan los posts nuevos o modificados)
+    search_docs = [{
+        'file': post['file'],
+        'hash': sources[post['file']]['source_hash'],
+        'title': post['title'],
+        'url': f"posts/{post['slug']}.html",
+        'category': post.get('category', 'AI Tools'),
+        'date': post['date'],
+    } for post in posts]
+    search, search_stats = update_search_index(
+        OUTPUT_DIR / "search", search_docs, load_post, previous.get('search', {})
+    )
+    if search_stats['indexed'] or search_stats['removed']:
+        print(f"  ✓ Search index: {search_stats['indexed']} indexed, "
+              f"{search_stats['removed']} removed, {search_stats['shards_written']} shards written")
+    
+    # Mantener la caché de renders de Markdown dentro de su límite de tamaño
+    evicted = render_cache.evict()
+    if evicted:
+        print(f"  ✗ Markdown cache: {evicted} least recently used renders evicted")
+    
+    # Publicar CSS y JS (minificados, con hash en el nombre y precomprimidos)
+    for published, (original, minified) in write_assets(OUTPUT_DIR).items():
+        print(f"  ✓ Generated: {published} ({original / 1024:.1f} KB → {minified / 1024:.1f} KB)")
+    
+    save_build_manifest({
+        'version': BUILD_MANIFEST_VERSION,
+        'config_hash': config_hash,
+        'posts': sources,
+        'pages': pages,
+        'feeds': feeds,
+        'search': search,
+        'related': related_state,
+    })
     
     print(f"\n✅ Site built successfully! {len(posts)} articles.")
     return posts
 
 
-def copy_assets():
-    """Copia los archivos CSS y JS al directorio de output."""
-    css_src = Path("/home/ubuntu/aitoolsblog/static/css/style.css")
-    js_src = Path("/home/ubuntu/aitoolsblog/static/js/main.js")
-    
-    if css_src.exists():
-        import shutil
-        shutil.copy(css_src, OUTPUT_DIR / "static" / "css" / "style.css")
-    if js_src.exists():
-        import shutil
-        shutil.copy(js_src, OUTPUT_DIR / "static" / "js" / "main.js")
-
-
 if __name__ == "__main__":
+    import argparse
+    parser = argparse.ArgumentParser()
+    parser.add_argument('command', nargs='?', choices=['build', 'relink'], default='build',
+                        help="'build' the site (default) or 'relink' affiliate URLs in saved posts")
+    parser.add_argument('--incremental', action='store_true',
+                        help='Only re-render posts that changed since the last build')
+    parser.add_argument('--jobs', type=int, default=1,
+                        help='Number of worker processes used to render posts')
+    parser.add_argument('--dry-run', action='store_true',
+                        help='With relink: report the changes without writing them')
+    args = parser.parse_args()
+    
     print("🚀 AI Tools Blog Generator")
     print("=" * 50)
-    build_site()
+    if args.command == 'relink':
+        relink_posts(jobs=args.jobs, dry_run=args.dry_run)
+    else:
+        build_site(incremental=args.incremental, jobs=args.jobs)
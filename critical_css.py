@@ -0,0 +1,120 @@
+#!/usr/bin/env python3
+"""
+AI Tools Hub - CSS crítico
+Extrae de la hoja de estilos las reglas que necesita la parte visible de
+cada página al cargar, las incrusta en un ``<style>`` del ``<head>`` y deja
+que la hoja completa se cargue de forma asíncrona, así el primer pintado no
+espera a descargar el CSS.
+
+Una regla es crítica si todos los tags, clases e ids de alguno de sus
+selectores aparecen en la página fuera de las zonas marcadas como
+``<!-- below-the-fold -->`` ... ``<!-- /below-the-fold -->`` en las
+plantillas (footers, últimos artículos de la homepage). Los selectores de
+interacción (``:hover``, ``:focus``...) nunca son críticos: no se ven hasta
+que el usuario hace algo, y para entonces ya cargó la hoja completa.
+"""
+
+import re
+from functools import lru_cache
+
+from assets import ASSETS, build_asset
+
+_BELOW_THE_FOLD = re.compile(r'<!-- below-the-fold -->.*?<!-- /below-the-fold -->', re.DOTALL)
+_HTML_TAG = re.compile(r'<([a-zA-Z][a-zA-Z0-9]*)')
+_HTML_CLASS = re.compile(r'\bclass="([^"]*)"')
+_HTML_ID = re.compile(r'\bid="([^"]*)"')
+
+_INTERACTIVE = re.compile(r':(?:hover|focus|focus-within|focus-visible|active|visited)\b')
+_PSEUDO = re.compile(r'::?[\w-]+(?:\([^)]*\))?|\[[^\]]*\]')
+_SELECTOR_TOKEN = re.compile(r'([.#]?)([\w-]+)')
+_ALWAYS_CRITICAL = {'*', ':root', 'html', 'body'}
+
+# Reemplaza el <link> de la hoja de estilos del sitio (ver partials/head.html)
+_STYLESHEET_LINK = re.compile(r'<link rel="stylesheet" href="([^"]*)">')
+
+
+def parse_rules(css: str) -> list:
+    """Divide CSS (minificado, sin comentarios) en ``[(prelude, cuerpo), ...]``.
+
+    Para los at-rules con bloques anidados (``@media``) el cuerpo es a su
+    vez una lista de reglas.
+    """
+    rules = []
+    i, n = 0, len(css)
+    while i < n:
+        start = css.find('{', i)
+        if start == -1:
+            break
+        prelude = css[i:start].strip()
+        depth, end = 1, start + 1
+        while end < n and depth:
+            depth += {'{': 1, '}': -1}.get(css[end], 0)
+            end += 1
+        body = css[start + 1:end - 1]
+        rules.append((prelude, parse_rules(body) if prelude.startswith('@media') else body))
+        i = end
+    return rules
+
+
+def page_tokens(html: str) -> set:
+    """Tags, ``.clases`` e ``#ids`` presentes en la parte visible de una página."""
+    html = _BELOW_THE_FOLD.sub('', html)
+    tokens = {tag.lower() for tag in _HTML_TAG.findall(html)}
+    for classes in _HTML_CLASS.findall(html):
+        tokens.update('.' + name for name in classes.split())
+    tokens.update('#' + name for name in _HTML_ID.findall(html))
+    return tokens
+
+
+def selector_is_critical(selector: str, tokens: set) -> bool:
+    selector = selector.strip()
+    if selector in _ALWAYS_CRITICAL:
+        return True
+    if _INTERACTIVE.search(selector):
+        return False
+    required = {prefix + (name if prefix else name.lower())
+                for prefix, name in _SELECTOR_TOKEN.findall(_PSEUDO.sub(' ', selector))}
+    return required <= tokens
+
+
+def critical_css(rules: list, tokens: set) -> str:
+    """Serializa las reglas (o la parte de su lista de selectores) que son críticas."""
+    out = []
+    for prelude, body in rules:
+        if isinstance(body, list):
+            inner = critical_css(body, tokens)
+            if inner:
+                out.append(f"{prelude}{{{inner}}}")
+        elif prelude.startswith('@'):
+            out.append(f"{prelude}{{{body}}}")
+        else:
+            selectors = [s for s in prelude.split(',') if selector_is_critical(s, tokens)]
+            if selectors:
+                out.append(f"{','.join(selectors)}{{{body}}}")
+    return ''.join(out)
+
+
+@lru_cache(maxsize=None)
+def stylesheet_rules() -> tuple:
+    """Ruta publicada y reglas de la hoja de estilos del sitio (ya minificada)."""
+    published, data = build_asset(ASSETS['style_css'])
+    return published, parse_rules(data.decode('utf-8'))
+
+
+def inline_critical_css(html: str) -> str:
+    """Incrusta el CSS crítico de la página y carga la hoja completa en diferido.
+
+    La hoja se pide con ``rel="preload"`` y se aplica al terminar de bajar;
+    sin JavaScript se carga normal desde el ``<noscript>``.
+    """
+    published, rules = stylesheet_rules()
+    match = next((m for m in _STYLESHEET_LINK.finditer(html) if m.group(1).endswith(published)), None)
+    if match is None:
+        return html
+    href = match.group(1)
+    replacement = (
+        f'<style>{critical_css(rules, page_tokens(html))}</style>'
+        f'<link rel="preload" href="{href}" as="style" onload="this.onload=null;this.rel=\'stylesheet\'">'
+        f'<noscript><link rel="stylesheet" href="{href}"></noscript>'
+    )
+    return html[:match.start()] + replacement + html[match.end():]
@@ -7,8 +7,6 @@ Diseñado para ser ejecutado por cron job o GitHub Actions.
 
 import os
 import sys
-import json
-import random
 import subprocess
 from datetime import datetime, timezone
 from pathlib import Path
@@ -16,13 +14,40 @@ from pathlib import Path
 # Agregar el directorio del blog al path
 sys.path.insert(0, str(Path(__file__).parent))
 
-from blog_generator import generate_article, save_post, build_site, POSTS_DIR
+from blog_generator import generate_article, save_post, build_site, load_post_index
+from gemini_client import generate_json, response_cache
 from content_topics import CONTENT_TOPICS, ADDITIONAL_TOPICS
+from near_duplicates import DuplicateChecker
+from topic_queue import TopicQueue
 
 # Ruta relativa al directorio del script (funciona tanto local como en GitHub Actions)
 _BASE_DIR = Path(__file__).parent
 LOG_FILE = _BASE_DIR / "automation.log"
 
+NEW_TOPIC_ATTEMPTS = 2       # Llamadas de generación de temas antes de rendirse
+AVOID_TITLES_IN_PROMPT = 50  # Títulos recientes que se le piden evitar al modelo
+TOPIC_REFILL_BATCH = 10      # Temas pedidos en cada llamada cuando la cola se vacía
+
+TOPIC_TYPES = ("review", "comparison", "guide", "listicle")
+TOPIC_CATEGORIES = ("Reviews", "Comparisons", "Guides")
+
+# Estructura que Gemini debe respetar al generar temas en lote
+TOPIC_BATCH_SCHEMA = {
+    'type': 'ARRAY',
+    'items': {
+        'type': 'OBJECT',
+        'properties': {
+            'title': {'type': 'STRING'},
+            'keyword': {'type': 'STRING'},
+            'secondary_keywords': {'type': 'ARRAY', 'items': {'type': 'STRING'}},
+            'type': {'type': 'STRING', 'enum': list(TOPIC_TYPES)},
+            'category': {'type': 'STRING', 'enum': list(TOPIC_CATEGORIES)},
+            'priority': {'type': 'INTEGER'},
+        },
+        'required': ['title', 'keyword', 'secondary_keywords', 'type', 'category', 'priority'],
+    },
+}
+
 
 def log(message: str):
     """Registra mensajes con timestamp."""
@@ -33,57 +58,123 @@ def log(message: str):
         f.write(log_entry + "\n")
 
 
-def get_published_topics() -> set:
+def get_published_topics(posts: list) -> set:
     """Retorna el conjunto de keywords ya publicadas."""
-    published = set()
-    for post_file in POSTS_DIR.glob("*.json"):
-        with open(post_file, 'r') as f:
-            data = json.load(f)
-            published.add(data.get('keyword', ''))
-    return published
+    return {post.get('keyword', '') for post in posts}
 
 
-def select_next_topic(published_keywords: set) -> dict | None:
-    """Selecciona el próximo tema a publicar basado en prioridad."""
-    all_topics = CONTENT_TOPICS + ADDITIONAL_TOPICS
-    
-    # Filtrar los ya publicados
-    available = [t for t in all_topics if t['keyword'] not in published_keywords]
-    
-    if not available:
-        log("⚠️ All predefined topics published. Generating new topic...")
-        return generate_new_topic()
-    
-    # Ordenar por prioridad (1 = más alta)
-    available.sort(key=lambda x: x.get('priority', 99))
-    
-    # Tomar el de mayor prioridad (con algo de variación)
-    top_priority = available[0]['priority']
-    top_topics = [t for t in available if t.get('priority', 99) == top_priority]
-    
-    return random.choice(top_topics)
+def is_near_duplicate_topic(topic: dict, checker: DuplicateChecker) -> bool:
+    """Indica (y registra) si un tema es casi igual a uno ya publicado."""
+    match = checker.find_topic(topic['title'], topic.get('keyword', ''))
+    if match is None:
+        return False
+    existing_title, score = match
+    log(f"⏭ Skipping near-duplicate topic: {topic['title']}")
+    log(f"   Similar to: {existing_title} (similarity {score:.2f})")
+    return True
 
 
-def generate_new_topic() -> dict:
-    """Genera un nuevo tema usando IA cuando se agotan los predefinidos."""
-    from google import genai
-    from google.genai import types
-    import os
-    model_client = genai.Client(api_key=os.environ.get("GEMINI_API_KEY"))
-    
-    prompt = """You are an SEO expert specializing in AI tools content. Generate a new blog topic for an AI tools review blog targeting freelancers and small businesses.
+def select_next_topic(queue: TopicQueue, checker: DuplicateChecker) -> dict | None:
+    """Saca de la cola el próximo tema a publicar.
+
+    La cola resuelve prioridad, fechas programadas y rotación de categorías;
+    los temas casi duplicados de un artículo publicado se descartan antes de
+    gastar una llamada de generación. Si no queda ningún tema disponible
+    hoy, la cola se rellena con un lote de temas generados por IA.
+    """
+    refilled = False
+    while True:
+        topic = queue.pop()
+        if topic is None:
+            if refilled:
+                return None
+            log("⚠️ Topic queue is empty. Generating new topics...")
+            refill_queue(queue, checker)
+            refilled = True
+            continue
+        if not is_near_duplicate_topic(topic, checker):
+            return topic
+
+
+def refill_queue(queue: TopicQueue, checker: DuplicateChecker, count: int = TOPIC_REFILL_BATCH) -> int:
+    """Agrega a la cola un lote de temas nuevos generados por IA.
+
+    Los temas sobrantes quedan en cola para los próximos días, así que la
+    generación de temas se hace una vez por lote y no una vez por día.
+    """
+    topics = generate_new_topics(queue, checker, count)
+    added = queue.extend(topics)
+    log(f"🧺 Added {added} generated topics to the queue")
+    return added
+
+
+def validate_topic(raw) -> dict | None:
+    """Normaliza un tema generado por IA; retorna None si no es utilizable."""
+    if not isinstance(raw, dict):
+        return None
+    title = str(raw.get('title') or '').strip()
+    keyword = ' '.join(str(raw.get('keyword') or '').lower().split())
+    if len(title) < 15 or not keyword:
+        return None
+    category = raw.get('category')
+    if category not in TOPIC_CATEGORIES:
+        return None
+    try:
+        priority = min(3, max(1, int(raw.get('priority', 2))))
+    except (TypeError, ValueError):
+        priority = 2
+    secondary = raw.get('secondary_keywords')
+    if not isinstance(secondary, list):
+        secondary = []
+    return {
+        'title': title,
+        'keyword': keyword,
+        'secondary_keywords': [str(k).strip() for k in secondary if str(k).strip()][:3],
+        'type': raw.get('type') if raw.get('type') in TOPIC_TYPES else 'guide',
+        'category': category,
+        'priority': priority,
+    }
+
+
+def generate_new_topics(queue: TopicQueue, checker: DuplicateChecker,
+                        count: int = TOPIC_REFILL_BATCH) -> list:
+    """Genera ``count`` temas nuevos en una sola llamada a Gemini.
+
+    La respuesta se valida tema por tema: se descartan los mal formados, las
+    keywords ya publicadas o en cola, los repetidos dentro del lote y los
+    casi duplicados de un artículo existente. Solo si no sobrevive ningún
+    tema se repite la llamada (hasta NEW_TOPIC_ATTEMPTS veces).
+    """
+    recent_titles = [entry[0] for entry in list(checker.topics.values())[:AVOID_TITLES_IN_PROMPT]]
+    avoid = '\n'.join(f"- {title}" for title in recent_titles)
+    prompt = f"""You are an SEO expert specializing in AI tools content. Generate {count} new, distinct blog topics for an AI tools review blog targeting freelancers and small businesses.
             
-Return JSON with: title, keyword, secondary_keywords (array of 3), type (review/comparison/guide/listicle), category (Reviews/Comparisons/Guides), priority (1-3)
+Return a JSON array; each item has: title, keyword, secondary_keywords (array of 3), type (review/comparison/guide/listicle), category (Reviews/Comparisons/Guides), priority (1-3)
 
 Focus on: AI writing tools, productivity AI, SEO tools, content creation AI.
-Make it specific and searchable."""
+Make each topic specific and searchable, and mix the categories.
+
+Do not propose a topic that covers the same subject as these existing articles:
+{avoid}"""
     
-    response = model_client.models.generate_content(
-        model="gemini-2.0-flash",
-        contents=prompt,
-        config=types.GenerateContentConfig(response_mime_type="application/json")
-    )
-    return json.loads(response.text)
+    for _ in range(NEW_TOPIC_ATTEMPTS):
+        # Sin caché: cada lote necesita temas nuevos
+        response = generate_json(prompt, use_cache=False, schema=TOPIC_BATCH_SCHEMA)
+        raw_topics = response if isinstance(response, list) else []
+        accepted = []
+        batch = DuplicateChecker()  # Temas ya aceptados de este lote
+        for raw in raw_topics:
+            topic = validate_topic(raw)
+            if topic is None or topic['keyword'] in queue or topic['keyword'] in queue.retired:
+                continue
+            if is_near_duplicate_topic(topic, checker) or is_near_duplicate_topic(topic, batch):
+                continue
+            batch.add_topic(topic['keyword'], topic['title'], topic['keyword'])
+            accepted.append(topic)
+        log(f"   {len(accepted)} of {len(raw_topics)} generated topics accepted")
+        if accepted:
+            return accepted
+    return []
 
 
 def publish_to_github(output_dir: Path):
@@ -133,24 +224,43 @@ def run_daily_automation():
     
     try:
         # 1. Obtener temas ya publicados
-        published = get_published_topics()
+        posts = load_post_index()
+        published = get_published_topics(posts)
+        checker = DuplicateChecker(posts)
         log(f"📊 Already published: {len(published)} articles")
         
-        # 2. Seleccionar próximo tema
-        topic = select_next_topic(published)
+        # 2. Seleccionar próximo tema (los temas nuevos de content_topics.py entran a la cola)
+        queue = TopicQueue.load()
+        imported = queue.extend(CONTENT_TOPICS + ADDITIONAL_TOPICS, exclude=published)
+        if imported:
+            log(f"📋 Queued {imported} new predefined topics")
+        topic = select_next_topic(queue, checker)
+        queue.save()
         if not topic:
             log("❌ No topic available. Exiting.")
             return False
         
         log(f"📝 Selected topic: {topic['title']}")
         log(f"   Keyword: {topic['keyword']}")
+        log(f"   Queue: {len(queue)} topics left")
         
-        # 3. Generar artículo con IA
+        # 3. Generar artículo con IA (si falla, el tema vuelve a la cola)
         log("🤖 Generating article with AI...")
-        article = generate_article(topic)
+        try:
+            article = generate_article(topic)
+        except Exception:
+            queue.requeue(topic)
+            queue.save()
+            raise
         log(f"   Title: {article['title']}")
         log(f"   Words: ~{len(article['content'].split())} words")
         log(f"   Read time: {article.get('estimated_read_time', 'N/A')} min")
+        duplicate = checker.find_article(article['content'])
+        if duplicate:
+            file, title, score = duplicate
+            article['near_duplicate_of'] = file
+            log(f"⚠️ Near-duplicate article: overlaps {score:.0%} with {title}")
+            log("   Flagged with 'near_duplicate_of' in the post JSON; review before promoting it.")
         
         # 4. Guardar el artículo
         post_file = save_post(article)
@@ -158,7 +268,7 @@ def run_daily_automation():
         
         # 5. Reconstruir el sitio
         log("🔨 Building static site...")
-        posts = build_site()
+        posts = build_site(incremental=True, jobs=os.cpu_count() or 1)
         log(f"   Total articles: {len(posts)}")
         
         # 6. Publicar en GitHub Pages
@@ -182,5 +292,13 @@ def run_daily_automation():
 
 
 if __name__ == "__main__":
+    import argparse
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--no-cache', action='store_true',
+                        help='Ignore cached Gemini responses and always call the API')
+    args = parser.parse_args()
+    if args.no_cache:
+        response_cache.enabled = False
+    
     success = run_daily_automation()
     sys.exit(0 if success else 1)
@@ -0,0 +1,108 @@
+#!/usr/bin/env python3
+"""
+AI Tools Hub - Caché en disco
+Caché de valores JSON direccionada por contenido, una entrada por clave en
+``<directorio>/<2 primeros caracteres>/<clave>.json``. La usan las
+respuestas de Gemini (gemini_client) y los renders de Markdown
+(markdown_render).
+
+Las entradas pueden caducar a los ``ttl`` segundos y, cuando el directorio
+supera ``max_bytes``, se expulsan las menos usadas (el mtime se actualiza en
+cada acierto, así que hace de marca LRU). Varios procesos e hilos pueden
+leer y escribir a la vez: cada escritura va a un temporal propio y se
+renombra.
+"""
+
+import hashlib
+import json
+import os
+import threading
+import time
+from pathlib import Path
+
+
+class DiskCache:
+    """Caché en disco de diccionarios JSON por clave.
+
+    ``ttl`` en segundos (None: las entradas no caducan). Con ``env_var`` la
+    caché se desactiva si esa variable de entorno vale ``0``.
+    """
+
+    def __init__(self, directory: Path, max_bytes: int, ttl: float | None = None,
+                 env_var: str | None = None):
+        self.directory = Path(directory)
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self.enabled = env_var is None or os.environ.get(env_var, "1") != "0"
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def make_key(*parts) -> str:
+        """SHA-256 (hex) de las partes que determinan el valor cacheado."""
+        payload = json.dumps(parts, sort_keys=True, ensure_ascii=False)
+        return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+    def _path(self, key: str) -> Path:
+        return self.directory / key[:2] / f"{key}.json"
+
+    def _expired(self, created: float, now: float) -> bool:
+        return self.ttl is not None and now - created > self.ttl
+
+    def files(self) -> list:
+        """Archivos de todas las entradas guardadas."""
+        return list(self.directory.glob("*/*.json"))
+
+    def get(self, key: str) -> dict | None:
+        """Retorna la entrada de ``key`` o None si no existe o caducó."""
+        if not self.enabled:
+            return None
+        path = self._path(key)
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                entry = json.load(f)
+        except (OSError, ValueError):
+            return None
+        if self._expired(entry.get('created', 0), time.time()):
+            path.unlink(missing_ok=True)
+            return None
+        try:
+            os.utime(path)
+        except OSError:
+            pass
+        return entry
+
+    def put(self, key: str, entry: dict):
+        """Guarda una entrada (escritura atómica) con su fecha de creación."""
+        if not self.enabled:
+            return
+        path = self._path(key)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_name(f"{path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump({'created': time.time(), **entry}, f, ensure_ascii=False)
+        os.replace(tmp_path, path)
+
+    def evict(self) -> int:
+        """Borra las entradas caducadas y las menos usadas hasta caber en
+        ``max_bytes``; retorna cuántas se borraron."""
+        with self._lock:
+            now = time.time()
+            entries = []
+            for path in self.files():
+                try:
+                    stat = path.stat()
+                except OSError:
+                    continue
+                entries.append((stat.st_mtime, stat.st_size, path))
+            entries.sort()
+            total = sum(size for _, size, _ in entries)
+            removed = 0
+            for mtime, size, path in entries:
+                # El mtime se renueva en cada acierto; si no se usó en ``ttl``
+                # segundos la entrada ya caducó
+                if total <= self.max_bytes and not self._expired(mtime, now):
+                    continue
+                path.unlink(missing_ok=True)
+                total -= size
+                removed += 1
+            return removed
@@ -0,0 +1,136 @@
+#!/usr/bin/env python3
+"""
+AI Tools Hub - Feeds RSS 2.0 y Atom
+Escritores en streaming: cada entrada se escribe a disco en cuanto se agrega,
+así que solo hay un artículo en memoria a la vez sin importar el tamaño del
+feed.
+"""
+
+import os
+from datetime import datetime, timezone
+from email.utils import format_datetime
+from pathlib import Path
+from xml.sax.saxutils import escape, quoteattr
+
+# Campos de cada entrada (dict) que reciben los métodos add():
+#   title, link, summary, date ('YYYY-MM-DD'), updated ('YYYY-MM-DD'),
+#   categories (lista), content_html (opcional, artículo completo)
+
+
+def _parse_date(value: str) -> datetime:
+    return datetime.strptime(value, '%Y-%m-%d').replace(tzinfo=timezone.utc)
+
+
+def _rfc822(value: str) -> str:
+    return format_datetime(_parse_date(value))
+
+
+def _rfc3339(value: str) -> str:
+    return _parse_date(value).strftime('%Y-%m-%dT%H:%M:%SZ')
+
+
+def _cdata(text: str) -> str:
+    return "<![CDATA[" + text.replace("]]>", "]]]]><![CDATA[>") + "]]>"
+
+
+class _AtomicWriter:
+    """Feed que se escribe a un temporal y se renombra al salir del ``with``.
+
+    Si hay una excepción dentro del bloque el temporal se descarta y el feed
+    anterior queda intacto.
+    """
+
+    def __init__(self, path: Path):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.tmp_path = self.path.with_name(self.path.name + '.tmp')
+        self.file = open(self.tmp_path, 'w', encoding='utf-8')
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, traceback):
+        if exc_type is None:
+            self.finish()
+        self.file.close()
+        if exc_type is None:
+            os.replace(self.tmp_path, self.path)
+        else:
+            self.tmp_path.unlink(missing_ok=True)
+
+    def finish(self):
+        """Escribe el cierre del documento."""
+
+
+class RssWriter(_AtomicWriter):
+    """Escribe un feed RSS 2.0 entrada por entrada (usar como context manager)."""
+
+    def __init__(self, path: Path, title: str, link: str, description: str,
+                 feed_url: str, updated: str | None = None):
+        super().__init__(path)
+        f = self.file
+        f.write('<?xml version="1.0" encoding="UTF-8"?>\n')
+        f.write('<rss version="2.0" xmlns:atom="http://www.w3.org/2005/Atom" '
+                'xmlns:content="http://purl.org/rss/1.0/modules/content/">\n')
+        f.write('<channel>\n')
+        f.write(f'    <title>{escape(title)}</title>\n')
+        f.write(f'    <link>{escape(link)}</link>\n')
+        f.write(f'    <description>{escape(description)}</description>\n')
+        f.write('    <language>en</language>\n')
+        f.write(f'    <atom:link href={quoteattr(feed_url)} rel="self" type="application/rss+xml"/>\n')
+        if updated:
+            f.write(f'    <lastBuildDate>{_rfc822(updated)}</lastBuildDate>\n')
+
+    def add(self, entry: dict):
+        f = self.file
+        f.write('    <item>\n')
+        f.write(f'        <title>{escape(entry["title"])}</title>\n')
+        f.write(f'        <link>{escape(entry["link"])}</link>\n')
+        f.write(f'        <guid isPermaLink="true">{escape(entry["link"])}</guid>\n')
+        f.write(f'        <pubDate>{_rfc822(entry["date"])}</pubDate>\n')
+        for category in entry.get('categories', []):
+            f.write(f'        <category>{escape(category)}</category>\n')
+        f.write(f'        <description>{escape(entry["summary"])}</description>\n')
+        if entry.get('content_html'):
+            f.write(f'        <content:encoded>{_cdata(entry["content_html"])}</content:encoded>\n')
+        f.write('    </item>\n')
+
+    def finish(self):
+        self.file.write('</channel>\n</rss>\n')
+
+
+class AtomWriter(_AtomicWriter):
+    """Escribe un feed Atom 1.0 entrada por entrada (usar como context manager)."""
+
+    def __init__(self, path: Path, title: str, link: str, description: str,
+                 feed_url: str, updated: str | None = None, author: str = ""):
+        super().__init__(path)
+        f = self.file
+        f.write('<?xml version="1.0" encoding="UTF-8"?>\n')
+        f.write('<feed xmlns="http://www.w3.org/2005/Atom">\n')
+        f.write(f'    <title>{escape(title)}</title>\n')
+        f.write(f'    <subtitle>{escape(description)}</subtitle>\n')
+        f.write(f'    <link href={quoteattr(link)}/>\n')
+        f.write(f'    <link href={quoteattr(feed_url)} rel="self" type="application/atom+xml"/>\n')
+        f.write(f'    <id>{escape(feed_url)}</id>\n')
+        f.write(f'    <updated>{_rfc3339(updated or "1970-01-01")}</updated>\n')
+        if author:
+            f.write(f'    <author><name>{escape(author)}</name></author>\n')
+
+    def add(self, entry: dict):
+        f = self.file
+        f.write('    <entry>\n')
+        f.write(f'        <title>{escape(entry["title"])}</title>\n')
+        f.write(f'        <link href={quoteattr(entry["link"])}/>\n')
+        f.write(f'        <id>{escape(entry["link"])}</id>\n')
+        f.write(f'        <published>{_rfc3339(entry["date"])}</published>\n')
+        f.write(f'        <updated>{_rfc3339(entry.get("updated") or entry["date"])}</updated>\n')
+        for category in entry.get('categories', []):
+            f.write(f'        <category term={quoteattr(category)}/>\n')
+        f.write(f'        <summary>{escape(entry["summary"])}</summary>\n')
+        if entry.get('content_html'):
+            f.write(f'        <content type="html">{escape(entry["content_html"])}</content>\n')
+        f.write('    </entry>\n')
+
+    def finish(self):
+        self.file.write('</feed>\n')
@@ -0,0 +1,365 @@
+#!/usr/bin/env python3
+"""
+AI Tools Hub - Cliente Gemini compartido
+Envuelve las llamadas a la API de Gemini con reintentos (backoff exponencial
+con jitter), un presupuesto global de reintentos, un límite opcional de
+llamadas por minuto (set_rate_limit), reparación/re-pregunta cuando el JSON
+viene mal formado y un circuit breaker que deja de llamar a la API tras
+varios fallos seguidos. Las respuestas válidas se guardan en una
+caché en disco para que los re-intentos de un run fallido no vuelvan a pagar
+la generación. generate_json_stream() recibe la respuesta en streaming y
+deja que un "watcher" la valide (y la corte) mientras llega.
+
+El SDK de Gemini se importa y el cliente se crea solo en la primera llamada,
+así que los scripts que solo construyen el sitio no pagan ese costo.
+"""
+
+import os
+import json
+import re
+import random
+import threading
+import time
+from pathlib import Path
+
+from disk_cache import DiskCache
+
+# ============================================================
+# CONFIGURACIÓN
+# ============================================================
+DEFAULT_MODEL = "gemini-2.0-flash"
+
+MAX_ATTEMPTS = 5          # Intentos por llamada (1 original + 4 reintentos)
+BASE_DELAY = 2.0          # Segundos del primer backoff
+MAX_DELAY = 60.0          # Tope de espera entre reintentos
+RETRY_BUDGET = 20         # Reintentos totales permitidos por proceso
+BREAKER_THRESHOLD = 5     # Fallos seguidos de la API que abren el circuito
+BREAKER_COOLDOWN = 300.0  # Segundos que el circuito permanece abierto
+
+# Caché de respuestas (direccionada por contenido: modelo + prompt + config)
+CACHE_DIR = Path(__file__).parent / ".cache" / "llm"
+CACHE_TTL = 7 * 24 * 3600          # Segundos que una respuesta sigue siendo válida
+CACHE_MAX_BYTES = 200 * 1024 ** 2  # Tamaño máximo antes de expulsar por LRU
+
+# Códigos HTTP transitorios que vale la pena reintentar
+RETRYABLE_STATUS = {408, 429, 500, 502, 503, 504}
+
+JSON_REASK_SUFFIX = """
+
+IMPORTANT: Your previous answer was not valid JSON. Reply with a single valid JSON value only, without Markdown fences or any text before or after it."""
+
+
+class GeminiUnavailableError(RuntimeError):
+    """La API no está disponible: el circuit breaker está abierto."""
+
+
+class ResponseRejected(ValueError):
+    """Un watcher rechazó la respuesta (a mitad del stream o al validarla)."""
+
+
+class CircuitBreaker:
+    """Circuit breaker thread-safe para la API de Gemini.
+
+    Tras ``threshold`` fallos consecutivos el circuito se abre y las llamadas
+    fallan de inmediato durante ``cooldown`` segundos; pasado ese tiempo se
+    deja pasar una llamada de prueba (half-open) que lo cierra si tiene éxito.
+    """
+
+    def __init__(self, threshold: int = BREAKER_THRESHOLD, cooldown: float = BREAKER_COOLDOWN):
+        self.threshold = threshold
+        self.cooldown = cooldown
+        self.failures = 0
+        self.opened_at = None
+        self._lock = threading.Lock()
+
+    def before_call(self):
+        """Lanza GeminiUnavailableError si el circuito está abierto."""
+        with self._lock:
+            if self.opened_at is None:
+                return
+            if time.monotonic() - self.opened_at < self.cooldown:
+                raise GeminiUnavailableError(
+                    f"Gemini circuit open after {self.failures} consecutive failures"
+                )
+            # Half-open: permitir una llamada de prueba
+            self.opened_at = None
+            self.failures = self.threshold - 1
+
+    def record_success(self):
+        with self._lock:
+            self.failures = 0
+            self.opened_at = None
+
+    def record_failure(self):
+        with self._lock:
+            self.failures += 1
+            if self.failures >= self.threshold:
+                self.opened_at = time.monotonic()
+
+
+class RetryBudget:
+    """Número máximo de reintentos compartido por todas las llamadas del proceso."""
+
+    def __init__(self, retries: int = RETRY_BUDGET):
+        self.remaining = retries
+        self._lock = threading.Lock()
+
+    def consume(self) -> bool:
+        """Consume un reintento; retorna False si el presupuesto está agotado."""
+        with self._lock:
+            if self.remaining <= 0:
+                return False
+            self.remaining -= 1
+            return True
+
+
+class RateLimiter:
+    """Token bucket thread-safe: limita las llamadas a la API por minuto.
+
+    El bucket se rellena a ``requests_per_minute / 60`` tokens por segundo y
+    acumula como máximo ``burst`` tokens, así que nunca se disparan más de
+    ``burst`` llamadas seguidas.
+    """
+
+    def __init__(self, requests_per_minute: float, burst: int = 1):
+        self.rate = requests_per_minute / 60.0
+        self.capacity = max(1, burst)
+        self.tokens = float(self.capacity)
+        self.updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self):
+        """Bloquea hasta que haya un token disponible y lo consume."""
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                wait = (1 - self.tokens) / self.rate
+            time.sleep(wait)
+
+
+_breaker = CircuitBreaker()
+_budget = RetryBudget()
+_limiter = None  # RateLimiter configurado con set_rate_limit(); None = sin límite
+response_cache = DiskCache(CACHE_DIR, CACHE_MAX_BYTES, ttl=CACHE_TTL, env_var="GEMINI_CACHE")
+
+
+_client = None
+_client_lock = threading.Lock()
+
+
+def _get_client():
+    """Retorna el cliente Gemini compartido, creándolo en el primer uso.
+
+    Un único cliente por proceso reutiliza su pool de conexiones HTTP entre
+    llamadas (y entre hilos) en lugar de abrir conexiones nuevas cada vez.
+    """
+    global _client
+    if _client is None:
+        with _client_lock:
+            if _client is None:
+                from google import genai
+                _client = genai.Client(api_key=os.environ.get("GEMINI_API_KEY"))
+    return _client
+
+
+def set_rate_limit(requests_per_minute: float | None, burst: int = 1):
+    """Limita las llamadas a la API del proceso (todas, incluidos reintentos
+    y re-preguntas); ``None`` quita el límite. Los aciertos de caché no
+    consumen tokens."""
+    global _limiter
+    _limiter = RateLimiter(requests_per_minute, burst) if requests_per_minute else None
+
+
+def _before_request():
+    """Comprueba el circuit breaker y espera un token del límite de llamadas."""
+    _breaker.before_call()
+    if _limiter is not None:
+        _limiter.acquire()
+
+
+def _cache_response(key: str, model: str, text: str):
+    """Guarda una respuesta válida en la caché y aplica su límite de tamaño."""
+    response_cache.put(key, {'model': model, 'text': text})
+    response_cache.evict()
+
+
+def is_retryable(error: Exception) -> bool:
+    """Indica si un error de la API es transitorio (429, 5xx, red)."""
+    import httpx
+    from google.genai import errors
+    if isinstance(error, errors.APIError):
+        return error.code in RETRYABLE_STATUS
+    return isinstance(error, (httpx.TransportError, ConnectionError, TimeoutError))
+
+
+def backoff_delay(attempt: int) -> float:
+    """Backoff exponencial con "full jitter" para el intento ``attempt`` (desde 0)."""
+    return random.uniform(0, min(MAX_DELAY, BASE_DELAY * 2 ** attempt))
+
+
+def parse_json_response(text: str):
+    """Parsea la respuesta JSON del modelo, reparando los defectos habituales.
+
+    Quita los bloques ```json, recorta el texto antes/después del JSON y
+    elimina comas finales. Lanza ValueError si aun así no es JSON válido.
+    """
+    try:
+        return json.loads(text)
+    except (TypeError, ValueError):
+        pass
+    cleaned = re.sub(r'^\s*```(?:json)?\s*|\s*```\s*$', '', text or '')
+    starts = [i for i in (cleaned.find('{'), cleaned.find('[')) if i != -1]
+    if starts:
+        start = min(starts)
+        end = cleaned.rfind('}' if cleaned[start] == '{' else ']')
+        cleaned = cleaned[start:end + 1]
+    cleaned = re.sub(r',\s*([}\]])', r'\1', cleaned)
+    try:
+        return json.loads(cleaned)
+    except ValueError as e:
+        raise ValueError(f"Invalid JSON response from Gemini: {e}") from e
+
+
+def _retry_or_raise(error: Exception, attempt: int, max_attempts: int, wait: bool = True):
+    """Espera el backoff del intento o relanza el error si no quedan reintentos."""
+    if attempt + 1 >= max_attempts or not _budget.consume():
+        raise error
+    if not wait:
+        print(f"  ↻ {error}; asking Gemini again...")
+        return
+    delay = backoff_delay(attempt)
+    print(f"  ↻ Gemini call failed ({error}); retrying in {delay:.1f}s...")
+    time.sleep(delay)
+
+
+def generate_json(prompt: str, model: str = DEFAULT_MODEL, max_attempts: int = MAX_ATTEMPTS,
+                  use_cache: bool = True, schema: dict | None = None, validate=None):
+    """Llama a Gemini pidiendo una respuesta JSON y la retorna parseada.
+
+    Los errores transitorios se reintentan con backoff; si la respuesta no es
+    JSON válido se intenta repararla y, si no se puede, se vuelve a preguntar
+    indicando el problema. Lanza GeminiUnavailableError con el circuito abierto.
+    Con ``use_cache`` las respuestas válidas se reutilizan desde disco.
+    ``schema`` (formato Schema de Gemini) fuerza la estructura de la respuesta.
+    ``validate(data)`` es la validación final del JSON parseado (también de
+    las respuestas cacheadas): si lanza ResponseRejected la respuesta no se
+    guarda en la caché y el error se propaga al llamador.
+    """
+    config_fields = {'response_mime_type': "application/json"}
+    if schema is not None:
+        config_fields['response_schema'] = schema
+    cache_key = DiskCache.make_key(model, prompt, config_fields)
+    if use_cache:
+        cached = response_cache.get(cache_key)
+        if cached is not None:
+            try:
+                data = parse_json_response(cached['text'])
+            except ValueError:
+                pass
+            else:
+                if validate is not None:
+                    validate(data)
+                return data
+    
+    from google.genai import types
+    config = types.GenerateContentConfig(**config_fields)
+    contents = prompt
+    for attempt in range(max_attempts):
+        _before_request()
+        try:
+            response = _get_client().models.generate_content(
+                model=model,
+                contents=contents,
+                config=config,
+            )
+        except Exception as e:
+            if not is_retryable(e):
+                raise
+            _breaker.record_failure()
+            _retry_or_raise(e, attempt, max_attempts)
+            continue
+        _breaker.record_success()
+        try:
+            data = parse_json_response(response.text)
+        except ValueError as e:
+            contents = prompt + JSON_REASK_SUFFIX
+            _retry_or_raise(e, attempt, max_attempts, wait=False)
+            continue
+        if validate is not None:
+            validate(data)
+        if use_cache:
+            _cache_response(cache_key, model, response.text)
+        return data
+
+
+def generate_json_stream(prompt: str, watcher, model: str = DEFAULT_MODEL,
+                         max_attempts: int = MAX_ATTEMPTS, use_cache: bool = True,
+                         schema: dict | None = None):
+    """Como generate_json(), pero recibiendo la respuesta en streaming.
+
+    ``watcher`` recibe el texto a medida que llega y puede cortar la
+    generación lanzando ResponseRejected (por ejemplo si la salida se sale
+    del esquema), sin esperar ni pagar el resto de la respuesta. Debe tener
+    los métodos ``reset()`` (nuevo intento), ``feed(chunk)`` y
+    ``finish(data)`` (validación final del JSON parseado; si rechaza, la
+    respuesta no se guarda en la caché). ResponseRejected se propaga al
+    llamador, que decide si regenerar.
+    """
+    config_fields = {'response_mime_type': "application/json"}
+    if schema is not None:
+        config_fields['response_schema'] = schema
+    cache_key = DiskCache.make_key(model, prompt, config_fields)
+    if use_cache:
+        cached = response_cache.get(cache_key)
+        if cached is not None:
+            try:
+                data = parse_json_response(cached['text'])
+            except ValueError:
+                pass
+            else:
+                watcher.finish(data)
+                return data
+    
+    from google.genai import types
+    config = types.GenerateContentConfig(**config_fields)
+    contents = prompt
+    for attempt in range(max_attempts):
+        _before_request()
+        watcher.reset()
+        parts = []
+        try:
+            stream = _get_client().models.generate_content_stream(
+                model=model,
+                contents=contents,
+                config=config,
+            )
+            for chunk in stream:
+                if chunk.text:
+                    parts.append(chunk.text)
+                    watcher.feed(chunk.text)
+        except ResponseRejected:
+            _breaker.record_success()
+            raise
+        except Exception as e:
+            if not is_retryable(e):
+                raise
+            _breaker.record_failure()
+            _retry_or_raise(e, attempt, max_attempts)
+            continue
+        _breaker.record_success()
+        text = ''.join(parts)
+        try:
+            data = parse_json_response(text)
+        except ValueError as e:
+            contents = prompt + JSON_REASK_SUFFIX
+            _retry_or_raise(e, attempt, max_attempts, wait=False)
+            continue
+        watcher.finish(data)
+        if use_cache:
+            _cache_response(cache_key, model, text)
+        return data
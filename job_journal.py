@@ -0,0 +1,112 @@
+#!/usr/bin/env python3
+"""
+AI Tools Hub - Diario de trabajos de generación
+Registro append-only (JSON Lines) del estado de cada tema en una generación
+en lote: ``queued`` -> ``in_flight`` -> ``done`` / ``failed``, con el número
+de intentos. Cada cambio se escribe y se sincroniza a disco antes de seguir,
+así que si el proceso muere a mitad de lote se puede retomar exactamente
+donde quedó: los temas ``done`` no se vuelven a generar y los ``in_flight``
+(interrumpidos) y ``failed`` se reintentan hasta MAX_ATTEMPTS.
+
+Como en el índice de posts, si un trabajo aparece varias veces gana la
+última línea.
+"""
+
+import json
+import os
+import threading
+from datetime import datetime, timezone
+from pathlib import Path
+
+MAX_ATTEMPTS = 3
+
+QUEUED = 'queued'
+IN_FLIGHT = 'in_flight'
+DONE = 'done'
+FAILED = 'failed'
+
+
+class JobJournal:
+    """Estado durable de los trabajos de un lote, indexado por keyword del tema."""
+
+    def __init__(self, path: Path):
+        self.path = Path(path)
+        self.jobs = {}  # keyword -> {'topic', 'state', 'attempts', 'post', 'error'}
+        self._lock = threading.Lock()
+
+    @classmethod
+    def load(cls, path: Path, max_attempts: int = MAX_ATTEMPTS) -> "JobJournal":
+        """Reconstruye el estado de cada trabajo leyendo el diario (vacío si no existe).
+
+        Una última línea incompleta (el proceso murió mientras la escribía)
+        se ignora. Los ``in_flight`` que ya agotaron sus intentos se marcan
+        como ``failed`` (interrumpidos).
+        """
+        journal = cls(path)
+        try:
+            with open(journal.path, 'r', encoding='utf-8') as f:
+                for line in f:
+                    try:
+                        record = json.loads(line)
+                    except ValueError:
+                        continue
+                    job = journal.jobs.setdefault(record['job'], {'attempts': 0})
+                    job.update({key: value for key, value in record.items() if key not in ('job', 'at')})
+        except OSError:
+            pass
+        for key, job in list(journal.jobs.items()):
+            if job['state'] == IN_FLIGHT and job['attempts'] >= max_attempts:
+                journal._append(key, state=FAILED, error="Interrupted: the process stopped during the last attempt")
+        return journal
+
+    def _append(self, key: str, **fields):
+        record = {'job': key, **fields, 'at': datetime.now(timezone.utc).strftime('%Y-%m-%dT%H:%M:%SZ')}
+        line = json.dumps(record, ensure_ascii=False) + "\n"
+        with self._lock:
+            with open(self.path, 'a', encoding='utf-8') as f:
+                f.write(line)
+                f.flush()
+                os.fsync(f.fileno())
+            self.jobs.setdefault(key, {'attempts': 0}).update(fields)
+
+    def add(self, topics: list, max_attempts: int = MAX_ATTEMPTS) -> int:
+        """Registra temas como ``queued``. Se omiten los que ya están en el
+        diario, salvo los ``failed`` sin intentos restantes, que vuelven a
+        empezar."""
+        added = 0
+        for topic in topics:
+            job = self.jobs.get(topic['keyword'])
+            if job is None or (job['state'] == FAILED and job['attempts'] >= max_attempts):
+                self._append(topic['keyword'], state=QUEUED, topic=topic, attempts=0)
+                added += 1
+        return added
+
+    def start(self, key: str) -> int:
+        """Marca un trabajo como ``in_flight``; retorna el número de intento."""
+        attempts = self.jobs[key]['attempts'] + 1
+        self._append(key, state=IN_FLIGHT, attempts=attempts)
+        return attempts
+
+    def finish(self, key: str, post: str):
+        self._append(key, state=DONE, post=post, error=None)
+
+    def fail(self, key: str, error: Exception):
+        self._append(key, state=FAILED, error=f"{type(error).__name__}: {error}")
+
+    def pending(self, max_attempts: int = MAX_ATTEMPTS) -> list:
+        """Temas por generar, en el orden en que se encolaron: los ``queued``
+        y los interrumpidos (``in_flight`` al cargar) o ``failed`` que aún
+        tienen intentos. Un ``in_flight`` ya cuenta el intento que estaba en
+        curso, así que un tema que tumba el proceso no se reintenta para
+        siempre."""
+        return [
+            job['topic'] for job in self.jobs.values()
+            if job['state'] == QUEUED
+            or (job['state'] in (IN_FLIGHT, FAILED) and job['attempts'] < max_attempts)
+        ]
+
+    def summary(self) -> dict:
+        counts = {QUEUED: 0, IN_FLIGHT: 0, DONE: 0, FAILED: 0}
+        for job in self.jobs.values():
+            counts[job['state']] += 1
+        return counts
@@ -0,0 +1,91 @@
+#!/usr/bin/env python3
+"""
+AI Tools Hub - Render de Markdown
+Convierte el contenido de los artículos a HTML con una instancia de
+``Markdown`` por proceso (reutilizada con ``reset()``) y guarda cada
+resultado en una caché en disco: la clave es el hash del contenido junto con
+la configuración de extensiones y las versiones de Markdown y Pygments, así
+que un cambio de layout (que obliga a re-renderizar todos los posts) no
+vuelve a pasar por Markdown ningún artículo cuyo contenido no cambió.
+
+Con ``MARKDOWN_CACHE=0`` en el entorno la caché se desactiva.
+"""
+
+import json
+import threading
+from functools import lru_cache
+from pathlib import Path
+
+from disk_cache import DiskCache
+
+CACHE_DIR = Path(__file__).parent / ".cache" / "markdown"
+CACHE_MAX_BYTES = 500 * 1024 ** 2  # Tamaño máximo antes de expulsar por LRU
+CACHE_VERSION = 1
+
+MARKDOWN_EXTENSIONS = ['extra', 'toc', 'codehilite']
+MARKDOWN_EXTENSION_CONFIGS = {}
+
+render_cache = DiskCache(CACHE_DIR, CACHE_MAX_BYTES, env_var="MARKDOWN_CACHE")
+_local = threading.local()
+
+
+def _markdown():
+    """Instancia de ``Markdown`` del proceso (una por hilo: no es thread-safe)."""
+    md = getattr(_local, 'md', None)
+    if md is None:
+        import markdown
+        md = _local.md = markdown.Markdown(extensions=MARKDOWN_EXTENSIONS,
+                                           extension_configs=MARKDOWN_EXTENSION_CONFIGS)
+    return md
+
+
+def _package_version(name: str) -> str | None:
+    from importlib.metadata import PackageNotFoundError, version
+    try:
+        return version(name)
+    except PackageNotFoundError:
+        return None
+
+
+@lru_cache(maxsize=None)
+def config_fingerprint() -> str:
+    """Todo lo que, además del contenido, cambia el HTML generado (Pygments
+    decide el HTML de los bloques de código de codehilite)."""
+    return json.dumps([
+        CACHE_VERSION, MARKDOWN_EXTENSIONS, MARKDOWN_EXTENSION_CONFIGS,
+        _package_version('markdown'), _package_version('pygments'),
+    ], sort_keys=True)
+
+
+def render_markdown(md_content: str) -> tuple:
+    """Convierte Markdown a HTML.
+
+    Retorna ``(html, toc_tokens)``: el árbol de encabezados de la extensión
+    ``toc``, con el id (slug del texto) que se le asignó a cada uno.
+    """
+    key = DiskCache.make_key(config_fingerprint(), md_content)
+    cached = render_cache.get(key)
+    if cached is not None:
+        return cached['html'], cached['toc']
+    md = _markdown()
+    md.reset()
+    html = md.convert(md_content)
+    toc = md.toc_tokens
+    render_cache.put(key, {'html': html, 'toc': toc})
+    return html, toc
+
+
+if __name__ == "__main__":
+    import argparse
+    parser = argparse.ArgumentParser(description="Manage the Markdown render cache")
+    parser.add_argument('command', choices=['stats', 'clear'])
+    args = parser.parse_args()
+
+    files = render_cache.files()
+    if args.command == 'clear':
+        for path in files:
+            path.unlink(missing_ok=True)
+        print(f"✓ Removed {len(files)} cached renders")
+    else:
+        size = sum(path.stat().st_size for path in files)
+        print(f"📦 Markdown cache: {len(files)} renders, {size / 1024 ** 2:.1f} MB in {render_cache.directory}")
@@ -0,0 +1,197 @@
+#!/usr/bin/env python3
+"""
+AI Tools Hub - Detección de duplicados
+Índice MinHash/LSH para detectar temas y artículos casi duplicados antes de
+gastar una llamada a Gemini (y evitar canibalización SEO entre posts).
+
+- Temas: se comparan por separado los términos de la keyword y los del
+  título (sin años ni plurales) y cuenta el más parecido, así "jasper ai
+  review 2027" choca con "jasper ai review" aunque los títulos difieran.
+- Artículos: se comparan shingles de 5 palabras del contenido. La firma
+  MinHash de cada post se guarda en su entrada del índice de posts, así que
+  no hay que volver a leer ni procesar el archivo completo en cada run.
+
+Las bandas LSH solo sirven para encontrar candidatos; cada candidato se
+confirma con la similitud de Jaccard (exacta para temas, estimada por la
+firma para artículos).
+"""
+
+import base64
+import hashlib
+import re
+
+from search_index import tokenize
+
+NUM_BANDS = 42
+ROWS_PER_BAND = 3
+NUM_PERM = NUM_BANDS * ROWS_PER_BAND
+SHINGLE_SIZE = 5
+
+TOPIC_THRESHOLD = 0.7    # Jaccard de términos a partir del cual dos temas son el mismo
+ARTICLE_THRESHOLD = 0.5  # Jaccard estimado de shingles para marcar un artículo
+
+_YEAR_PATTERN = re.compile(r'^(19|20)\d\d$')
+_MARKDOWN_LINK = re.compile(r'\]\([^)]*\)')
+
+
+def _normalize_term(term: str) -> str:
+    if len(term) > 3 and term.endswith('s') and not term.endswith('ss'):
+        return term[:-1]
+    return term
+
+
+def topic_terms(text: str) -> frozenset:
+    """Términos que identifican un tema (sin stopwords, años ni plurales)."""
+    return frozenset(
+        _normalize_term(term) for term in tokenize(text)
+        if not _YEAR_PATTERN.match(term)
+    )
+
+
+def content_shingles(content: str) -> set:
+    """Shingles de SHINGLE_SIZE palabras del contenido Markdown (sin URLs de links).
+
+    Las URLs se quitan porque los links de afiliados se insertan después de
+    generar el artículo y no deben cambiar su firma.
+    """
+    tokens = tokenize(_MARKDOWN_LINK.sub(']', content))
+    if len(tokens) < SHINGLE_SIZE:
+        return {' '.join(tokens)} if tokens else set()
+    return {' '.join(tokens[i:i + SHINGLE_SIZE]) for i in range(len(tokens) - SHINGLE_SIZE + 1)}
+
+
+def _hash_parameters():
+    """Coeficientes fijos de las NUM_PERM funciones hash (multiply-shift)."""
+    import numpy as np
+
+    seed = hashlib.sha256(b"aitoolshub-minhash").digest()
+    rng = np.random.default_rng(int.from_bytes(seed[:8], 'little'))
+    a = rng.integers(1, 2 ** 63, size=NUM_PERM, dtype=np.uint64) | np.uint64(1)
+    b = rng.integers(0, 2 ** 63, size=NUM_PERM, dtype=np.uint64)
+    return a[:, None], b[:, None]
+
+
+_parameters = None
+
+
+def minhash(shingles) -> bytes:
+    """Firma MinHash (NUM_PERM valores uint32) de un conjunto de shingles."""
+    import numpy as np
+
+    global _parameters
+    if _parameters is None:
+        _parameters = _hash_parameters()
+    a, b = _parameters
+    if not shingles:
+        return np.full(NUM_PERM, 0xFFFFFFFF, dtype=np.uint32).tobytes()
+    hashes = np.fromiter(
+        (int.from_bytes(hashlib.blake2b(s.encode('utf-8'), digest_size=8).digest(), 'little')
+         for s in shingles),
+        dtype=np.uint64, count=len(shingles),
+    )
+    # (a*x + b) mod 2^64 y nos quedamos con los 32 bits altos
+    values = ((a * hashes[None, :] + b) >> np.uint64(32)).min(axis=1)
+    return values.astype(np.uint32).tobytes()
+
+
+def encode_signature(signature: bytes) -> str:
+    return base64.b64encode(signature).decode('ascii')
+
+
+def decode_signature(text: str) -> bytes:
+    return base64.b64decode(text)
+
+
+def signature_similarity(a: bytes, b: bytes) -> float:
+    """Jaccard estimado: fracción de posiciones iguales entre dos firmas."""
+    import numpy as np
+
+    return float(np.mean(np.frombuffer(a, dtype=np.uint32) == np.frombuffer(b, dtype=np.uint32)))
+
+
+def jaccard(a: frozenset, b: frozenset) -> float:
+    if not a or not b:
+        return 0.0
+    return len(a & b) / len(a | b)
+
+
+class LSHIndex:
+    """Bandas LSH sobre firmas MinHash: ``candidates()`` devuelve las claves
+    que comparten al menos una banda con la firma consultada."""
+
+    def __init__(self):
+        self.buckets = {}
+
+    @staticmethod
+    def _bands(signature: bytes):
+        width = ROWS_PER_BAND * 4
+        for band in range(NUM_BANDS):
+            yield band, signature[band * width:(band + 1) * width]
+
+    def add(self, key, signature: bytes):
+        for band in self._bands(signature):
+            self.buckets.setdefault(band, set()).add(key)
+
+    def candidates(self, signature: bytes) -> set:
+        found = set()
+        for band in self._bands(signature):
+            found |= self.buckets.get(band, set())
+        return found
+
+
+class DuplicateChecker:
+    """Índice de temas y artículos publicados para detectar casi duplicados.
+
+    Se construye desde las entradas del índice de posts (``load_post_index()``);
+    ``add_topic()`` / ``add_article()`` registran temas y artículos nuevos del
+    mismo run para que tampoco se repitan entre sí.
+    """
+
+    def __init__(self, posts: list = ()):
+        self.topics = {}      # clave -> (título, términos del título, términos de la keyword)
+        self.articles = {}    # clave -> (título, firma)
+        self._topic_lsh = LSHIndex()
+        self._article_lsh = LSHIndex()
+        for post in posts:
+            self.add_topic(post['file'], post.get('title', ''), post.get('keyword', ''))
+            if post.get('minhash'):
+                self.articles[post['file']] = (post.get('title', ''), decode_signature(post['minhash']))
+                self._article_lsh.add(post['file'], self.articles[post['file']][1])
+
+    def add_topic(self, key: str, title: str, keyword: str = ""):
+        title_terms, keyword_terms = topic_terms(title), topic_terms(keyword)
+        self.topics[key] = (title, title_terms, keyword_terms)
+        self._topic_lsh.add(key, minhash(title_terms))
+        if keyword_terms:
+            self._topic_lsh.add(key, minhash(keyword_terms))
+
+    def add_article(self, key: str, title: str, content: str):
+        signature = minhash(content_shingles(content))
+        self.articles[key] = (title, signature)
+        self._article_lsh.add(key, signature)
+
+    def find_topic(self, title: str, keyword: str = "") -> tuple | None:
+        """Retorna ``(título existente, similitud)`` del tema más parecido, o None."""
+        title_terms, keyword_terms = topic_terms(title), topic_terms(keyword)
+        candidates = self._topic_lsh.candidates(minhash(title_terms))
+        if keyword_terms:
+            candidates |= self._topic_lsh.candidates(minhash(keyword_terms))
+        best = None
+        for key in candidates:
+            existing_title, existing_title_terms, existing_keyword_terms = self.topics[key]
+            score = max(jaccard(title_terms, existing_title_terms),
+                        jaccard(keyword_terms, existing_keyword_terms))
+            if score >= TOPIC_THRESHOLD and (best is None or score > best[1]):
+                best = (existing_title, score)
+        return best
+
+    def find_article(self, content: str) -> tuple | None:
+        """Retorna ``(clave, título, similitud)`` del artículo más parecido, o None."""
+        signature = minhash(content_shingles(content))
+        best = None
+        for key in self._article_lsh.candidates(signature):
+            title, existing = self.articles[key]
+            score = signature_similarity(signature, existing)
+            if score >= ARTICLE_THRESHOLD and (best is None or score > best[2]):
+                best = (key, title, score)
+        return best
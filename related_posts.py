@@ -0,0 +1,153 @@
+#!/usr/bin/env python3
+"""
+AI Tools Hub - Artículos relacionados
+Calcula en el build los artículos más parecidos a cada post con TF-IDF y
+similitud coseno sobre título, tags y keyword, tomados del índice de posts
+(no hace falta abrir el JSON de cada artículo).
+
+Los vectores TF-IDF son dispersos (``{término: peso}`` por post, con una
+lista de postings por término), así que la memoria crece con los términos
+de cada post y no con posts × vocabulario, y la fila de similitudes de un
+post solo recorre los posts que comparten algún término con él.
+
+El resultado se guarda en el manifest del build y se actualiza de forma
+incremental: para un post nuevo o modificado solo se calcula su fila de
+similitudes contra el resto, y esa misma fila se usa para meterlo en el
+top-k de los demás. Todas las filas solo se recalculan cuando el archivo
+creció lo suficiente como para que los pesos IDF guardados hayan quedado
+desactualizados.
+"""
+
+import hashlib
+import math
+
+from search_index import tokenize
+
+RELATED_INDEX_VERSION = 1
+FULL_REBUILD_GROWTH = 1.25  # Recalcular todo si el archivo creció un 25%
+MIN_SIMILARITY = 0.05       # Por debajo de esto dos posts no se consideran relacionados
+
+
+def post_features(post: dict) -> list:
+    """Términos de un post usados para compararlo (título, tags y keyword)."""
+    text = ' '.join([post.get('title', ''), post.get('keyword', '')] + list(post.get('tags', [])))
+    return tokenize(text)
+
+
+def _features_hash(terms: list) -> str:
+    return hashlib.sha256(' '.join(terms).encode('utf-8')).hexdigest()[:16]
+
+
+def _tfidf_vectors(documents: list) -> tuple:
+    """Vectores TF-IDF dispersos (normalizados L2) de una lista de listas de términos.
+
+    Retorna ``(vectors, postings)``: ``vectors[i]`` es ``{término: peso}``
+    del documento ``i`` y ``postings[término]`` la lista ``[(i, peso), ...]``
+    de los documentos que lo contienen.
+    """
+    term_counts = []
+    df = {}
+    for terms in documents:
+        counts = {}
+        for term in terms:
+            counts[term] = counts.get(term, 0) + 1
+        term_counts.append(counts)
+        for term in counts:
+            df[term] = df.get(term, 0) + 1
+
+    n = len(documents)
+    idf = {term: math.log((1 + n) / (1 + count)) + 1 for term, count in df.items()}
+    vectors = []
+    postings = {}
+    for row, counts in enumerate(term_counts):
+        weights = {term: (1.0 + math.log(count)) * idf[term] for term, count in counts.items()}
+        norm = math.sqrt(sum(weight * weight for weight in weights.values())) or 1.0
+        vector = {term: weight / norm for term, weight in weights.items()}
+        vectors.append(vector)
+        for term, weight in vector.items():
+            postings.setdefault(term, []).append((row, weight))
+    return vectors, postings
+
+
+def _similarities(row: int, vector: dict, postings: dict) -> dict:
+    """Similitud coseno de un documento con los que comparten algún término
+    (``{fila: similitud}``, sin el propio documento)."""
+    scores = {}
+    for term, weight in vector.items():
+        for other, other_weight in postings[term]:
+            scores[other] = scores.get(other, 0.0) + weight * other_weight
+    scores.pop(row, None)  # Un post no se relaciona consigo mismo
+    return scores
+
+
+def _top_k(files: list, scores: dict, k: int) -> list:
+    """Los ``k`` posts con mayor similitud de una fila (desempate por nombre)."""
+    ranked = sorted(
+        ((round(score, 6), files[j]) for j, score in scores.items() if score >= MIN_SIMILARITY),
+        key=lambda item: (-item[0], item[1]),
+    )
+    return [[file, score] for score, file in ranked[:k]]
+
+
+def update_related_posts(posts: list, state: dict, k: int) -> tuple:
+    """Actualiza los artículos relacionados de cada post.
+
+    ``posts`` son entradas del índice de posts; ``state`` es el estado del
+    build anterior (``{"version", "k", "base_n", "features": {file: hash},
+    "links": {file: [[file, score], ...]}}``). Retorna ``(estado nuevo,
+    estadísticas)``. Se recalculan solo las filas de los posts nuevos o
+    modificados y de los que tenían en su top-k un post borrado o
+    modificado; el resto solo puede ganar un vecino nuevo.
+    """
+    files = [post['file'] for post in posts]
+    documents = [post_features(post) for post in posts]
+    features = {file: _features_hash(terms) for file, terms in zip(files, documents)}
+
+    full = (
+        state.get('version') != RELATED_INDEX_VERSION
+        or state.get('k') != k
+        or len(files) > state.get('base_n', 0) * FULL_REBUILD_GROWTH
+    )
+    previous_features = {} if full else state.get('features', {})
+    previous_links = {} if full else state.get('links', {})
+
+    # Posts cuyos términos cambiaron (nuevos o editados) y posts que ya no existen
+    changed = {file for file in files if previous_features.get(file) != features[file]}
+    gone = (previous_features.keys() - features.keys()) | changed
+    dirty = changed | {
+        file for file, neighbours in previous_links.items()
+        if file in features and any(other in gone for other, _ in neighbours)
+    }
+
+    links = {file: previous_links[file] for file in files if file not in dirty}
+    position = {file: i for i, file in enumerate(files)}
+    if dirty:
+        vectors, postings = _tfidf_vectors(documents)
+        # Un post nuevo/modificado puede entrar en el top-k de los posts no recalculados
+        additions = {}
+        for file in sorted(dirty):
+            row = position[file]
+            scores = _similarities(row, vectors[row], postings)
+            links[file] = _top_k(files, scores, k)
+            if file not in changed:
+                continue
+            for j, score in scores.items():
+                if score >= MIN_SIMILARITY and files[j] not in dirty:
+                    additions.setdefault(files[j], []).append([file, round(score, 6)])
+
+        for file, candidates in additions.items():
+            current = links[file]
+            if len(current) >= k and max(score for _, score in candidates) < current[-1][1]:
+                continue
+            candidates = current + candidates
+            candidates.sort(key=lambda item: (-item[1], item[0]))
+            links[file] = candidates[:k]
+
+    new_state = {
+        'version': RELATED_INDEX_VERSION,
+        'k': k,
+        'base_n': len(files) if full else state['base_n'],
+        'features': features,
+        'links': links,
+    }
+    return new_state, {'full': full, 'recomputed': len(dirty)}
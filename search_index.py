@@ -0,0 +1,178 @@
+#!/usr/bin/env python3
+"""
+AI Tools Hub - Índice de búsqueda estático
+Genera un índice invertido en JSON para la búsqueda del lado del cliente
+(static/js/main.js). Los términos se reparten en shards por sus dos primeras
+letras (``search/wr.json`` contiene "writesonic", "writing"...), así el
+navegador solo descarga los shards de las palabras buscadas.
+
+Formato:
+    search/docs.json   {"n": total, "docs": {id: [título, url, categoría, fecha]}}
+    search/<xx>.json   {término: [id, peso, id, peso, ...]}
+
+El índice se actualiza por post: solo se tokenizan los posts nuevos o
+modificados y solo se reescriben los shards que cambian.
+"""
+
+import json
+import re
+from pathlib import Path
+
+SEARCH_INDEX_VERSION = 1
+DOCS_FILE_NAME = "docs.json"
+
+# Peso de cada aparición de un término según el campo donde aparece
+FIELD_WEIGHTS = {'title': 5, 'keyword': 3, 'tags': 3, 'content': 1}
+MAX_TERMS_PER_DOC = 150  # Solo los términos más pesados de cada artículo
+
+# Debe coincidir con SEARCH_STOPWORDS en static/js/main.js
+STOPWORDS = frozenset("""
+a about after all also an and any are as at be because been but by can could
+do does for from get has have how if in into is it its just more most my no
+not of on or our out so than that the their them then there these they this
+to up us use using was we what when which while who why will with without
+you your
+""".split())
+
+_TOKEN_PATTERN = re.compile(r'[a-z0-9]+')
+_MARKDOWN_NOISE = re.compile(r'```[\s\S]*?```|`[^`]*`|\]\([^)]*\)|<[^>]+>|https?://\S+')
+
+
+def tokenize(text: str) -> list:
+    """Separa un texto en términos normalizados (minúsculas, sin stopwords)."""
+    return [
+        token for token in _TOKEN_PATTERN.findall(text.lower())
+        if len(token) > 1 and token not in STOPWORDS
+    ]
+
+
+def shard_key(term: str) -> str:
+    return term[:2]
+
+
+def document_terms(post: dict) -> dict:
+    """Retorna ``{término: peso}`` de un post (título, keyword, tags y contenido)."""
+    weights = {}
+    fields = {
+        'title': post.get('title', ''),
+        'keyword': post.get('keyword', ''),
+        'tags': ' '.join(post.get('tags', [])),
+        'content': _MARKDOWN_NOISE.sub(' ', post.get('content', '')),
+    }
+    for field, text in fields.items():
+        weight = FIELD_WEIGHTS[field]
+        for token in tokenize(text):
+            weights[token] = weights.get(token, 0) + weight
+    top = sorted(weights.items(), key=lambda item: (-item[1], item[0]))[:MAX_TERMS_PER_DOC]
+    return dict(top)
+
+
+class SearchIndex:
+    """Índice invertido persistido en ``search_dir``; se carga shard a shard."""
+
+    def __init__(self, search_dir: Path):
+        self.search_dir = Path(search_dir)
+        self.shards = {}
+        self.dirty = set()
+
+    def shard(self, key: str) -> dict:
+        if key not in self.shards:
+            path = self.search_dir / f"{key}.json"
+            try:
+                with open(path, 'r', encoding='utf-8') as f:
+                    self.shards[key] = json.load(f)
+            except (OSError, ValueError):
+                self.shards[key] = {}
+        return self.shards[key]
+
+    def load_all(self):
+        for path in self.search_dir.glob("*.json"):
+            if path.name != DOCS_FILE_NAME:
+                self.shard(path.stem)
+
+    def remove_docs(self, doc_ids: set):
+        """Quita los documentos de todos los shards (requiere load_all())."""
+        for key, shard in self.shards.items():
+            for term in list(shard):
+                postings = shard[term]
+                kept = []
+                for i in range(0, len(postings), 2):
+                    if postings[i] not in doc_ids:
+                        kept.extend(postings[i:i + 2])
+                if len(kept) != len(postings):
+                    self.dirty.add(key)
+                    if kept:
+                        shard[term] = kept
+                    else:
+                        del shard[term]
+
+    def add_doc(self, doc_id: int, terms: dict):
+        for term, weight in terms.items():
+            key = shard_key(term)
+            self.shard(key).setdefault(term, []).extend((doc_id, weight))
+            self.dirty.add(key)
+
+    def save(self) -> int:
+        """Escribe los shards modificados (borra los vacíos); retorna cuántos."""
+        self.search_dir.mkdir(parents=True, exist_ok=True)
+        for key in self.dirty:
+            path = self.search_dir / f"{key}.json"
+            shard = self.shards[key]
+            if shard:
+                with open(path, 'w', encoding='utf-8') as f:
+                    json.dump(shard, f, ensure_ascii=False, separators=(',', ':'), sort_keys=True)
+            else:
+                path.unlink(missing_ok=True)
+        return len(self.dirty)
+
+
+def update_search_index(search_dir: Path, docs: list, load_post, state: dict) -> tuple:
+    """Actualiza el índice de búsqueda de forma incremental.
+
+    ``docs`` es una lista de dicts con ``file``, ``hash``, ``title``, ``url``,
+    ``category`` y ``date`` (del índice de posts); ``load_post(file)`` carga
+    el post completo. ``state`` es el estado del build anterior
+    (``{"version", "next_id", "docs": {file: [id, hash]}}``). Retorna
+    ``(estado nuevo, estadísticas)``. Solo se tokenizan los posts cuyo hash
+    cambió; los shards completos solo se cargan si hay documentos que quitar.
+    """
+    search_dir = Path(search_dir)
+    if state.get('version') != SEARCH_INDEX_VERSION or not (search_dir / DOCS_FILE_NAME).exists():
+        for path in search_dir.glob("*.json"):
+            path.unlink()
+        state = {}
+    previous = state.get('docs', {})
+    next_id = state.get('next_id', 0)
+
+    current = {doc['file']: doc for doc in docs}
+    removed = {
+        doc_id for file, (doc_id, doc_hash) in previous.items()
+        if file not in current or current[file]['hash'] != doc_hash
+    }
+    added = [doc for doc in docs if previous.get(doc['file'], [None, None])[1] != doc['hash']]
+
+    index = SearchIndex(search_dir)
+    if removed:
+        index.load_all()
+        index.remove_docs(removed)
+    new_docs = {
+        file: entry for file, entry in previous.items()
+        if file in current and entry[0] not in removed
+    }
+    for doc in added:
+        index.add_doc(next_id, document_terms(load_post(doc['file'])))
+        new_docs[doc['file']] = [next_id, doc['hash']]
+        next_id += 1
+    shards_written = index.save()
+
+    doc_table = {
+        str(new_docs[doc['file']][0]): [doc['title'], doc['url'], doc['category'], doc['date']]
+        for doc in docs
+    }
+    with open(search_dir / DOCS_FILE_NAME, 'w', encoding='utf-8') as f:
+        json.dump({'n': len(doc_table), 'docs': doc_table}, f,
+                  ensure_ascii=False, separators=(',', ':'))
+
+    new_state = {'version': SEARCH_INDEX_VERSION, 'next_id': next_id, 'docs': new_docs}
+    stats = {'indexed': len(added), 'removed': len(removed), 'shards_written': shards_written}
+    return new_state, stats
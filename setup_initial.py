@@ -5,192 +5,150 @@ Genera los primeros 10 artículos del blog para tener contenido desde el día 1.
 """
 
 import sys
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from pathlib import Path
 
 sys.path.insert(0, str(Path(__file__).parent))
 
-from blog_generator import generate_article, save_post, build_site
+from blog_generator import generate_article, save_post, build_site, load_post_index, OUTPUT_DIR
 from content_topics import CONTENT_TOPICS
-from daily_automation import log
+from daily_automation import is_near_duplicate_topic, log
+from gemini_client import response_cache, set_rate_limit
+from job_journal import DONE, FAILED, JobJournal
+from near_duplicates import DuplicateChecker
 
 
-def generate_static_pages():
-    """Genera las páginas estáticas del blog (About, Privacy, Disclaimer)."""
-    output_dir = Path(__file__).parent / "output"
-    
-    # About page
-    about_html = """<!DOCTYPE html>
-<html lang="en">
-<head>
-    <meta charset="UTF-8">
-    <meta name="viewport" content="width=device-width, initial-scale=1.0">
-    <title>About Us | AI Tools Hub</title>
-    <meta name="description" content="AI Tools Hub is your trusted source for honest AI tool reviews, comparisons, and guides.">
-    <link rel="stylesheet" href="static/css/style.css">
-</head>
-<body>
-    <header>
-        <nav>
-            <a href="index.html" class="logo">AI Tools Hub</a>
-            <ul>
-                <li><a href="index.html">Home</a></li>
-                <li><a href="categories/reviews.html">Reviews</a></li>
-                <li><a href="categories/comparisons.html">Comparisons</a></li>
-                <li><a href="categories/guides.html">Guides</a></li>
-            </ul>
-        </nav>
-    </header>
-    <main style="max-width:800px;margin:60px auto;padding:0 20px;">
-        <h1>About AI Tools Hub</h1>
-        <p>AI Tools Hub is an independent blog dedicated to helping freelancers, content creators, and small business owners navigate the rapidly growing world of AI tools.</p>
-        <h2>Our Mission</h2>
-        <p>We test, review, and compare the best AI tools on the market so you don't have to. Our goal is to save you time and money by providing honest, thorough, and practical reviews.</p>
-        <h2>What We Cover</h2>
-        <ul>
-            <li>AI Writing Tools (Jasper, Writesonic, Copy.ai, etc.)</li>
-            <li>AI SEO Tools (Surfer SEO, Clearscope, etc.)</li>
-            <li>AI Productivity Tools</li>
-            <li>AI Marketing Tools</li>
-        </ul>
-        <h2>Affiliate Disclosure</h2>
-        <p>Some links on this site are affiliate links. If you click through and make a purchase, we may earn a small commission at no extra cost to you. This helps us keep the site running and producing quality content. See our full <a href="disclaimer.html">Affiliate Disclaimer</a>.</p>
-    </main>
-    <footer class="site-footer">
-        <div class="footer-content">
-            <p>&copy; 2026 AI Tools Hub. All rights reserved.</p>
-            <nav><a href="about.html">About</a> | <a href="privacy.html">Privacy Policy</a> | <a href="disclaimer.html">Affiliate Disclaimer</a></nav>
-        </div>
-    </footer>
-</body>
-</html>"""
-    
-    # Privacy Policy
-    privacy_html = """<!DOCTYPE html>
-<html lang="en">
-<head>
-    <meta charset="UTF-8">
-    <meta name="viewport" content="width=device-width, initial-scale=1.0">
-    <title>Privacy Policy | AI Tools Hub</title>
-    <link rel="stylesheet" href="static/css/style.css">
-</head>
-<body>
-    <header>
-        <nav>
-            <a href="index.html" class="logo">AI Tools Hub</a>
-            <ul><li><a href="index.html">Home</a></li></ul>
-        </nav>
-    </header>
-    <main style="max-width:800px;margin:60px auto;padding:0 20px;">
-        <h1>Privacy Policy</h1>
-        <p><em>Last updated: February 2026</em></p>
-        <h2>Information We Collect</h2>
-        <p>We use Google Analytics to collect anonymous usage data to improve our content. We do not collect personally identifiable information.</p>
-        <h2>Cookies</h2>
-        <p>We use cookies for analytics purposes only. You can disable cookies in your browser settings.</p>
-        <h2>Third-Party Links</h2>
-        <p>Our site contains links to third-party websites. We are not responsible for their privacy practices.</p>
-        <h2>Contact</h2>
-        <p>If you have questions about this privacy policy, please contact us through our website.</p>
-    </main>
-    <footer class="site-footer">
-        <div class="footer-content">
-            <p>&copy; 2026 AI Tools Hub. All rights reserved.</p>
-        </div>
-    </footer>
-</body>
-</html>"""
-    
-    # Affiliate Disclaimer
-    disclaimer_html = """<!DOCTYPE html>
-<html lang="en">
-<head>
-    <meta charset="UTF-8">
-    <meta name="viewport" content="width=device-width, initial-scale=1.0">
-    <title>Affiliate Disclaimer | AI Tools Hub</title>
-    <link rel="stylesheet" href="static/css/style.css">
-</head>
-<body>
-    <header>
-        <nav>
-            <a href="index.html" class="logo">AI Tools Hub</a>
-            <ul><li><a href="index.html">Home</a></li></ul>
-        </nav>
-    </header>
-    <main style="max-width:800px;margin:60px auto;padding:0 20px;">
-        <h1>Affiliate Disclaimer</h1>
-        <p><em>Last updated: February 2026</em></p>
-        <p>AI Tools Hub participates in affiliate marketing programs. This means that when you click on certain links on our site and make a purchase, we may earn a commission.</p>
-        <h2>Our Commitment</h2>
-        <p>Our affiliate relationships do not influence our reviews or recommendations. We only recommend products and services we genuinely believe are valuable to our readers.</p>
-        <h2>Programs We Participate In</h2>
-        <ul>
-            <li>Amazon Associates Program</li>
-            <li>Writesonic Affiliate Program</li>
-            <li>Jasper AI Affiliate Program</li>
-            <li>Surfer SEO Affiliate Program</li>
-            <li>Various other SaaS affiliate programs</li>
-        </ul>
-        <p>Affiliate commissions help us keep this site running and producing free, high-quality content for our readers. Thank you for your support!</p>
-    </main>
-    <footer class="site-footer">
-        <div class="footer-content">
-            <p>&copy; 2026 AI Tools Hub. All rights reserved.</p>
-        </div>
-    </footer>
-</body>
-</html>"""
-    
-    with open(output_dir / "about.html", 'w') as f:
-        f.write(about_html)
-    with open(output_dir / "privacy.html", 'w') as f:
-        f.write(privacy_html)
-    with open(output_dir / "disclaimer.html", 'w') as f:
-        f.write(disclaimer_html)
-    
-    # robots.txt
-    robots_txt = f"""User-agent: *
-Allow: /
+# Límites por defecto para la generación en lote (tier gratuito de Gemini Flash)
+DEFAULT_CONCURRENCY = 4
+DEFAULT_REQUESTS_PER_MINUTE = 15
 
-Sitemap: https://aitoolshub.github.io/sitemap.xml
-"""
-    with open(output_dir / "robots.txt", 'w') as f:
-        f.write(robots_txt)
-    
-    log("✓ Static pages generated (About, Privacy, Disclaimer, robots.txt)")
+# Diario de la generación en lote (permite retomar un lote interrumpido)
+JOURNAL_FILE = Path(__file__).parent / "generation_journal.jsonl"
+
+
+def select_topics(topics: list, count: int, checker: DuplicateChecker) -> list:
+    """Toma los primeros ``count`` temas que no sean casi duplicados de un post
+    existente ni de otro tema ya elegido."""
+    selected = []
+    for topic in topics:
+        if len(selected) >= count:
+            break
+        if is_near_duplicate_topic(topic, checker):
+            continue
+        checker.add_topic(topic['keyword'], topic['title'], topic['keyword'])
+        selected.append(topic)
+    return selected
+
+
+def generate_articles(topics: list, concurrency: int = DEFAULT_CONCURRENCY,
+                      requests_per_minute: float = DEFAULT_REQUESTS_PER_MINUTE,
+                      checker: DuplicateChecker | None = None,
+                      journal: JobJournal | None = None) -> list:
+    """Genera y guarda artículos en paralelo respetando el límite de la API.
 
+    Cada tema se procesa de forma aislada: un error solo afecta a ese tema.
+    Con ``checker`` los artículos casi duplicados (de un post existente o de
+    otro del mismo lote) se marcan con ``near_duplicate_of``. Con ``journal``
+    el inicio, fin o fallo de cada tema queda registrado en disco.
+    Retorna una lista de ``(topic, article | None, error | None)`` en el
+    mismo orden que ``topics``.
+    """
+    set_rate_limit(requests_per_minute)
+    checker_lock = threading.Lock()
+    total = len(topics)
 
-def run_initial_setup(num_articles: int = 5):
+    def worker(index: int, topic: dict):
+        if journal is None:
+            return generate_one(index, topic)
+        attempt = journal.start(topic['keyword'])
+        try:
+            article, post_file = generate_one(index, topic, attempt)
+        except Exception as e:
+            journal.fail(topic['keyword'], e)
+            raise
+        journal.finish(topic['keyword'], post_file.name)
+        return article, post_file
+
+    def generate_one(index: int, topic: dict, attempt: int = 1):
+        retry = f" (attempt {attempt})" if attempt > 1 else ""
+        log(f"[{index}/{total}] Generating: {topic['title']}{retry}")
+        article = generate_article(topic)
+        if checker is not None:
+            with checker_lock:
+                duplicate = checker.find_article(article['content'])
+                checker.add_article(article['slug'], article['title'], article['content'])
+            if duplicate:
+                file, title, score = duplicate
+                article['near_duplicate_of'] = file
+                log(f"   ⚠️ Near-duplicate article: {article['title']} overlaps {score:.0%} with {title}")
+        return article, save_post(article)
+
+    results = [None] * total
+    with ThreadPoolExecutor(max_workers=max(1, concurrency)) as executor:
+        futures = {
+            executor.submit(worker, i, topic): i - 1
+            for i, topic in enumerate(topics, 1)
+        }
+        for future in as_completed(futures):
+            position = futures[future]
+            topic = topics[position]
+            try:
+                article, _ = future.result()
+                results[position] = (topic, article, None)
+                log(f"   ✓ Generated: {article['title']}")
+            except Exception as e:
+                results[position] = (topic, None, e)
+                log(f"   ❌ Error ({topic['title']}): {e}")
+    return results
+
+
+def run_initial_setup(num_articles: int = 5, concurrency: int = DEFAULT_CONCURRENCY,
+                      requests_per_minute: float = DEFAULT_REQUESTS_PER_MINUTE):
     """Genera los primeros artículos del blog."""
     log("=" * 60)
     log("🚀 AI Tools Hub - Initial Setup")
     log(f"   Generating first {num_articles} articles...")
     log("=" * 60)
     
-    # Tomar los primeros N temas de mayor prioridad
-    priority_topics = sorted(CONTENT_TOPICS, key=lambda x: x.get('priority', 99))
-    selected_topics = priority_topics[:num_articles]
+    # Retomar el lote anterior si quedó a medias; si no, tomar los primeros N
+    # temas de mayor prioridad (sin casi duplicados)
+    published = load_post_index()
+    checker = DuplicateChecker(published)
+    journal = JobJournal.load(JOURNAL_FILE)
+    selected_topics = journal.pending()
     
-    for i, topic in enumerate(selected_topics, 1):
-        log(f"\n[{i}/{num_articles}] Generating: {topic['title']}")
-        try:
-            article = generate_article(topic)
-            save_post(article)
-            log(f"   ✓ Generated: {article['title']}")
-        except Exception as e:
-            log(f"   ❌ Error: {e}")
-            continue
+    # Un tema cuyo post se guardó justo antes de un corte ya está publicado:
+    # regenerarlo lo marcaría como duplicado de sí mismo (o crearía otro archivo
+    # con la fecha de hoy)
+    published_files = {post['keyword']: post['file'] for post in published if post.get('keyword')}
+    for topic in [topic for topic in selected_topics if topic['keyword'] in published_files]:
+        journal.finish(topic['keyword'], published_files[topic['keyword']])
+        selected_topics.remove(topic)
+        log(f"   ↷ Already published: {topic['title']}")
+    if selected_topics:
+        summary = journal.summary()
+        log(f"♻️ Resuming unfinished batch: {len(selected_topics)} topics pending "
+            f"({summary[DONE]} already done, {summary[FAILED]} failed)")
+    else:
+        priority_topics = sorted(CONTENT_TOPICS, key=lambda x: x.get('priority', 99))
+        selected_topics = select_topics(priority_topics, num_articles, checker)
+        journal.add(selected_topics)
     
-    # Construir el sitio
+    results = generate_articles(selected_topics, concurrency, requests_per_minute, checker, journal)
+    failed = [topic for topic, article, error in results if error is not None]
+    if failed:
+        log(f"⚠️ {len(failed)} of {len(results)} articles failed to generate")
+        log("   Run the setup again to retry them; finished articles are not regenerated.")
+    
+    # Construir el sitio (incluye las páginas estáticas y robots.txt)
     log("\n🔨 Building complete site...")
     posts = build_site()
     
-    # Generar páginas estáticas
-    generate_static_pages()
-    
     log("\n" + "=" * 60)
     log(f"✅ Initial setup complete!")
     log(f"   Articles generated: {len(posts)}")
-    log(f"   Output directory: /home/ubuntu/aitoolsblog/output/")
+    log(f"   Output directory: {OUTPUT_DIR}/")
     log("=" * 60)
     
     return posts
@@ -200,6 +158,14 @@ if __name__ == "__main__":
     import argparse
     parser = argparse.ArgumentParser()
     parser.add_argument('--articles', type=int, default=5, help='Number of initial articles to generate')
+    parser.add_argument('--concurrency', type=int, default=DEFAULT_CONCURRENCY,
+                        help='Maximum number of articles generated at the same time')
+    parser.add_argument('--rpm', type=float, default=DEFAULT_REQUESTS_PER_MINUTE,
+                        help='Maximum Gemini requests per minute')
+    parser.add_argument('--no-cache', action='store_true',
+                        help='Ignore cached Gemini responses and always call the API')
     args = parser.parse_args()
+    if args.no_cache:
+        response_cache.enabled = False
     
-    run_initial_setup(args.articles)
+    run_initial_setup(args.articles, args.concurrency, args.rpm)
@@ -0,0 +1,139 @@
+#!/usr/bin/env python3
+"""
+AI Tools Hub - Sitemaps
+Escritor de sitemaps en streaming: cada URL se escribe directo a disco (y a
+su copia .xml.gz) sin armar el XML en memoria, partiendo en varios archivos
+cuando se alcanza el límite del protocolo (50.000 URLs o 50 MB por archivo)
+y generando un sitemap-index.xml que los enlaza.
+"""
+
+import gzip
+from pathlib import Path
+from xml.sax.saxutils import escape
+
+# Límites del protocolo sitemaps.org
+MAX_URLS_PER_SITEMAP = 50000
+MAX_BYTES_PER_SITEMAP = 50 * 1024 * 1024
+
+SITEMAP_INDEX_NAME = "sitemap-index.xml"
+
+_URLSET_OPEN = (
+    '<?xml version="1.0" encoding="UTF-8"?>\n'
+    '<urlset xmlns="http://www.sitemaps.org/schemas/sitemap/0.9">\n'
+).encode('utf-8')
+_URLSET_CLOSE = b'</urlset>\n'
+
+
+def _gzip_file(path: str) -> gzip.GzipFile:
+    """Abre un .gz para escritura con mtime fijo (salida byte a byte reproducible)."""
+    return gzip.GzipFile(path, 'wb', compresslevel=9, mtime=0)
+
+
+class SitemapWriter:
+    """Escribe URLs en shards ``sitemap-N.xml`` (+ ``.xml.gz``) y un índice.
+
+    Uso::
+
+        with SitemapWriter(output_dir, base_url) as writer:
+            writer.add(f"{base_url}/index.html", lastmod="2026-01-01")
+
+    Al cerrar se escribe ``sitemap-index.xml`` (y su ``.gz``) con un
+    ``<sitemap>`` por shard y el ``lastmod`` más reciente de cada uno.
+    """
+
+    def __init__(self, output_dir: Path, base_url: str,
+                 max_urls: int = MAX_URLS_PER_SITEMAP,
+                 max_bytes: int = MAX_BYTES_PER_SITEMAP):
+        self.output_dir = Path(output_dir)
+        self.base_url = base_url.rstrip('/')
+        self.max_urls = max_urls
+        self.max_bytes = max_bytes
+        self.shards = []  # [[nombre, lastmod más reciente], ...]
+        self._files = None
+        self._urls = 0
+        self._bytes = 0
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, traceback):
+        self.close()
+
+    def _open_shard(self):
+        name = f"sitemap-{len(self.shards) + 1}.xml"
+        path = self.output_dir / name
+        self._files = (open(path, 'wb'), _gzip_file(f"{path}.gz"))
+        self.shards.append([name, None])
+        self._urls = 0
+        self._bytes = 0
+        self._write(_URLSET_OPEN)
+
+    def _close_shard(self):
+        if self._files is None:
+            return
+        self._write(_URLSET_CLOSE)
+        for f in self._files:
+            f.close()
+        self._files = None
+
+    def _write(self, data: bytes):
+        for f in self._files:
+            f.write(data)
+        self._bytes += len(data)
+
+    def add(self, loc: str, lastmod: str | None = None,
+            changefreq: str | None = None, priority: str | None = None):
+        """Agrega una URL al shard actual, abriendo uno nuevo si está lleno."""
+        parts = [f"    <url>\n        <loc>{escape(loc)}</loc>\n"]
+        if lastmod:
+            parts.append(f"        <lastmod>{escape(lastmod)}</lastmod>\n")
+        if changefreq:
+            parts.append(f"        <changefreq>{changefreq}</changefreq>\n")
+        if priority:
+            parts.append(f"        <priority>{priority}</priority>\n")
+        parts.append("    </url>\n")
+        entry = ''.join(parts).encode('utf-8')
+
+        full = self._files is not None and (
+            self._urls >= self.max_urls
+            or self._bytes + len(entry) + len(_URLSET_CLOSE) > self.max_bytes
+        )
+        if full:
+            self._close_shard()
+        if self._files is None:
+            self._open_shard()
+        self._write(entry)
+        self._urls += 1
+        shard = self.shards[-1]
+        if lastmod and (shard[1] is None or lastmod > shard[1]):
+            shard[1] = lastmod
+
+    def close(self):
+        """Cierra el shard abierto y escribe el sitemap-index.xml."""
+        self._close_shard()
+        if not self.shards:
+            self._open_shard()
+            self._close_shard()
+        lines = [
+            '<?xml version="1.0" encoding="UTF-8"?>',
+            '<sitemapindex xmlns="http://www.sitemaps.org/schemas/sitemap/0.9">',
+        ]
+        for name, lastmod in self.shards:
+            lines.append("    <sitemap>")
+            lines.append(f"        <loc>{escape(self.base_url)}/{name}</loc>")
+            if lastmod:
+                lines.append(f"        <lastmod>{escape(lastmod)}</lastmod>")
+            lines.append("    </sitemap>")
+        lines.append("</sitemapindex>\n")
+        data = '\n'.join(lines).encode('utf-8')
+        index_path = self.output_dir / SITEMAP_INDEX_NAME
+        index_path.write_bytes(data)
+        with _gzip_file(f"{index_path}.gz") as f:
+            f.write(data)
+
+    def remove_stale_shards(self):
+        """Borra shards de builds anteriores que ya no forman parte del índice."""
+        current = {name for name, _ in self.shards}
+        for path in self.output_dir.glob("sitemap-[0-9]*.xml*"):
+            if path.name.removesuffix('.gz') not in current:
+                path.unlink()
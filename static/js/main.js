@@ -15,9 +15,10 @@ document.addEventListener('DOMContentLoaded', function() {
     document.querySelectorAll('a[href^="#"]').forEach(anchor => {
         anchor.addEventListener('click', function(e) {
             e.preventDefault();
-            const target = document.querySelector(this.getAttribute('href'));
+            const target = document.getElementById(this.getAttribute('href').slice(1));
             if (target) {
                 target.scrollIntoView({ behavior: 'smooth', block: 'start' });
+                history.replaceState(null, '', '#' + target.id);
             }
         });
     });
@@ -36,33 +37,163 @@ document.addEventListener('DOMContentLoaded', function() {
         const scrolled = (window.scrollY / docHeight) * 100;
         progressBar.style.width = Math.min(scrolled, 100) + '%';
     });
+});
+
+// ============================================================
+// Site search (prebuilt sharded index in /search, see search_index.py)
+// ============================================================
+// Must match STOPWORDS in search_index.py
+const SEARCH_STOPWORDS = new Set((
+    'a about after all also an and any are as at be because been but by can could ' +
+    'do does for from get has have how if in into is it its just more most my no ' +
+    'not of on or our out so than that the their them then there these they this ' +
+    'to up us use using was we what when which while who why will with without ' +
+    'you your'
+).split(' '));
+const SEARCH_MAX_RESULTS = 8;
+
+function searchTokenize(text) {
+    return (text.toLowerCase().match(/[a-z0-9]+/g) || [])
+        .filter(token => token.length > 1 && !SEARCH_STOPWORDS.has(token));
+}
 
-    // Table of contents auto-generation for articles
-    const articleContent = document.querySelector('.article-content');
-    if (articleContent) {
-        const headings = articleContent.querySelectorAll('h2, h3');
-        if (headings.length > 2) {
-            const toc = document.createElement('div');
-            toc.className = 'toc-container';
-            toc.innerHTML = '<h4>📋 Table of Contents</h4><ul></ul>';
-            toc.style.cssText = `
-                background: #f5f3ff; border: 1px solid #e5e7eb;
-                border-radius: 8px; padding: 20px; margin: 24px 0;
-            `;
-            
-            const tocList = toc.querySelector('ul');
-            headings.forEach((heading, i) => {
-                const id = 'heading-' + i;
-                heading.id = id;
-                const li = document.createElement('li');
-                li.style.marginLeft = heading.tagName === 'H3' ? '16px' : '0';
-                li.innerHTML = `<a href="#${id}" style="color: #6366f1;">${heading.textContent}</a>`;
-                tocList.appendChild(li);
+function createSearch(root) {
+    const cache = new Map();
+    const fetchJson = (path) => {
+        if (!cache.has(path)) {
+            cache.set(path, fetch(root + 'search/' + path)
+                .then(response => (response.ok ? response.json() : {}))
+                .catch(() => ({})));
+        }
+        return cache.get(path);
+    };
+
+    // Scores documents with TF-IDF; the last term also matches as a prefix
+    // so results update while the user is still typing the word.
+    return async function search(query) {
+        const terms = searchTokenize(query);
+        if (!terms.length) return [];
+        const [index, ...shards] = await Promise.all(
+            [fetchJson('docs.json')].concat(terms.map(term => fetchJson(term.slice(0, 2) + '.json')))
+        );
+        const total = index.n || 1;
+        const scores = new Map();
+        terms.forEach((term, i) => {
+            const shard = shards[i] || {};
+            const isLast = i === terms.length - 1;
+            const matches = isLast
+                ? Object.keys(shard).filter(key => key.startsWith(term))
+                : (shard[term] ? [term] : []);
+            matches.forEach(key => {
+                const postings = shard[key];
+                const idf = Math.log(1 + total / (postings.length / 2));
+                const boost = key === term ? 1 : 0.5;
+                for (let j = 0; j < postings.length; j += 2) {
+                    const docId = postings[j];
+                    scores.set(docId, (scores.get(docId) || 0) + postings[j + 1] * idf * boost);
+                }
             });
-            
-            articleContent.insertBefore(toc, articleContent.firstChild);
+        });
+        return [...scores.entries()]
+            .sort((a, b) => b[1] - a[1])
+            .slice(0, SEARCH_MAX_RESULTS)
+            .map(([docId]) => index.docs[docId])
+            .filter(Boolean)
+            .map(([title, url, category, date]) => ({ title, url: root + url, category, date }));
+    };
+}
+
+document.addEventListener('DOMContentLoaded', function() {
+    const form = document.querySelector('.search-form');
+    const input = document.getElementById('search-input');
+    const results = document.getElementById('search-results');
+    if (!form || !input || !results) return;
+
+    const search = createSearch(form.dataset.root || '');
+    let timer = null;
+    let lastQuery = '';
+
+    const render = (items) => {
+        results.textContent = '';
+        if (!items.length) {
+            results.innerHTML = '<p class="search-empty">No articles found.</p>';
         }
+        items.forEach(item => {
+            const link = document.createElement('a');
+            link.href = item.url;
+            link.className = 'search-result';
+            link.innerHTML = '<span class="search-result-title"></span><small></small>';
+            link.firstChild.textContent = item.title;
+            link.lastChild.textContent = item.category + ' · ' + item.date;
+            results.appendChild(link);
+        });
+        results.hidden = false;
+    };
+
+    input.addEventListener('input', () => {
+        clearTimeout(timer);
+        timer = setTimeout(async () => {
+            const query = input.value.trim();
+            lastQuery = query;
+            if (!query) {
+                results.hidden = true;
+                return;
+            }
+            const items = await search(query);
+            if (query === lastQuery) render(items);
+        }, 150);
+    });
+    form.addEventListener('submit', (e) => {
+        e.preventDefault();
+        const first = results.querySelector('a');
+        if (first) window.location.href = first.href;
+    });
+    document.addEventListener('click', (e) => {
+        if (!form.contains(e.target)) results.hidden = true;
+    });
+});
+
+// ============================================================
+// Lazy AdSense: the ad script is only requested when the first slot gets
+// close to the viewport, and each slot is filled as it scrolls into view.
+// Slots are rendered as <ins class="adsbygoogle-lazy"> so AdSense ignores
+// them until they get the real class right before push().
+// ============================================================
+const ADSENSE_SCRIPT = 'https://pagead2.googlesyndication.com/pagead/js/adsbygoogle.js';
+const AD_ROOT_MARGIN = '300px 0px';
+
+function loadAdSense(client) {
+    if (document.querySelector('script[data-adsense]')) return;
+    const script = document.createElement('script');
+    script.async = true;
+    script.crossOrigin = 'anonymous';
+    script.dataset.adsense = '';
+    script.src = ADSENSE_SCRIPT + '?client=' + encodeURIComponent(client);
+    document.head.appendChild(script);
+}
+
+function fillAdSlot(slot) {
+    loadAdSense(slot.dataset.adClient);
+    slot.classList.replace('adsbygoogle-lazy', 'adsbygoogle');
+    (window.adsbygoogle = window.adsbygoogle || []).push({});
+}
+
+document.addEventListener('DOMContentLoaded', function() {
+    const slots = document.querySelectorAll('ins.adsbygoogle-lazy');
+    if (!slots.length) return;
+    if (!('IntersectionObserver' in window)) {
+        slots.forEach(fillAdSlot);
+        return;
     }
+    const observer = new IntersectionObserver((entries) => {
+        entries.forEach(entry => {
+            if (entry.isIntersecting) {
+                observer.unobserve(entry.target);
+                fillAdSlot(entry.target);
+            }
+        });
+    }, { rootMargin: AD_ROOT_MARGIN });
+    slots.forEach(slot => observer.observe(slot));
 });
 
 // Google Analytics placeholder
@@ -0,0 +1,126 @@
+#!/usr/bin/env python3
+"""
+AI Tools Hub - Motor de plantillas
+Compila una sola vez las plantillas HTML de templates/ (fragmentos
+literales + huecos con nombre) a funciones Python, y las cachea por proceso.
+
+Sintaxis:
+    {{ nombre }}                       inserta el valor de ``nombre``
+    {% include "partials/x.html" %}    inserta otra plantilla (al compilar)
+"""
+
+import re
+from functools import lru_cache
+from pathlib import Path
+
+TEMPLATES_DIR = Path(__file__).parent / "templates"
+
+_TOKEN_PATTERN = re.compile(r'\{\{\s*(\w+)\s*\}\}')
+_INCLUDE_PATTERN = re.compile(r'\{%\s*include\s+"([^"]+)"\s*%\}')
+
+
+class Template:
+    """Plantilla compilada a una función Python.
+
+    ``parts`` alterna texto literal (índices pares) y nombres de variable
+    (índices impares), tal como lo devuelve ``re.split`` con un grupo. Al
+    compilar se genera una función cuyo cuerpo es una única expresión
+    f-string, así que renderizar cuesta lo mismo que un f-string escrito a
+    mano.
+    """
+
+    def __init__(self, parts: list, name: str = "<string>"):
+        self.name = name
+        self.parts = parts
+        self.variables = sorted(set(parts[1::2]))
+        # render(**context) -> str; lanza TypeError si falta alguna variable.
+        # Es directamente la función compilada, sin un método intermedio.
+        self.render = self._compile_function()
+        self._row_renderers = {}
+
+    def _expression(self) -> str:
+        pieces = []
+        for i, part in enumerate(self.parts):
+            if i % 2:
+                pieces.append(f"f'{{{part}}}'")
+            elif part:
+                pieces.append(repr(part))
+        return ' '.join(pieces) or repr('')
+
+    def _exec(self, source: str, function: str):
+        namespace = {}
+        exec(compile(source, f"<template {self.name}>", "exec"), namespace)
+        return namespace[function]
+
+    def _compile_function(self):
+        params = ''.join(f"{variable}, " for variable in self.variables)
+        signature = f"*, {params}**_" if params else "**_"
+        return self._exec(f"def render({signature}):\n    return ({self._expression()})\n", 'render')
+
+    def render_rows(self, columns: tuple, rows, separator: str = '\n') -> str:
+        """Renderiza la plantilla una vez por fila y une los resultados.
+
+        Cada fila es una tupla con los valores de ``columns`` en ese orden.
+        El bucle vive dentro de la función compilada (una list comprehension
+        sobre la expresión f-string, unida con un solo ``join``), así que
+        renderizar N filas no cuesta N llamadas a render() con keywords.
+        """
+        renderer = self._row_renderers.get(columns)
+        if renderer is None:
+            missing = set(self.variables) - set(columns)
+            if missing:
+                raise TypeError(f"render_rows() missing columns for {self.name}: {', '.join(sorted(missing))}")
+            source = (f"def render_rows(_rows, _separator):\n"
+                      f"    return _separator.join([{self._expression()} for {', '.join(columns)}, in _rows])\n")
+            renderer = self._row_renderers[columns] = self._exec(source, 'render_rows')
+        return renderer(rows, separator)
+
+    @classmethod
+    def compile(cls, source: str, name: str = "<string>") -> "Template":
+        return cls(_TOKEN_PATTERN.split(source), name)
+
+    def bind(self, **values) -> "Template":
+        """Retorna una copia con algunas variables ya resueltas.
+
+        Los valores fijos (configuración del blog, partials renderizados) se
+        funden con el texto literal vecino, así cada render posterior recorre
+        menos huecos.
+        """
+        merged = [self.parts[0]]
+        for i in range(1, len(self.parts), 2):
+            name, literal = self.parts[i], self.parts[i + 1]
+            if name in values:
+                merged[-1] += str(values[name]) + literal
+            else:
+                merged.extend((name, literal))
+        return Template(merged, self.name)
+
+
+def _load_source(name: str, seen: tuple = ()) -> str:
+    """Lee una plantilla resolviendo sus includes de forma recursiva."""
+    if name in seen:
+        raise ValueError(f"Circular include in template: {' -> '.join(seen + (name,))}")
+    source = (TEMPLATES_DIR / name).read_text(encoding='utf-8')
+    return _INCLUDE_PATTERN.sub(
+        lambda match: _load_source(match.group(1), seen + (name,)).rstrip('\n'),
+        source,
+    )
+
+
+@lru_cache(maxsize=None)
+def get_template(name: str) -> Template:
+    """Retorna la plantilla ``name`` de TEMPLATES_DIR compilada (cacheada por proceso)."""
+    return Template.compile(_load_source(name).rstrip('\n'), name)
+
+
+def render(name: str, **context) -> str:
+    """Atajo para ``get_template(name).render(**context)``."""
+    return get_template(name).render(**context)
+
+
+def templates_fingerprint() -> bytes:
+    """Contenido de todas las plantillas, para detectar cambios de layout."""
+    return b''.join(
+        path.relative_to(TEMPLATES_DIR).as_posix().encode() + b'\0' + path.read_bytes()
+        for path in sorted(TEMPLATES_DIR.rglob("*.html"))
+    )
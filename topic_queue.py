@@ -0,0 +1,228 @@
+#!/usr/bin/env python3
+"""
+AI Tools Hub - Cola de temas
+Cola persistente de temas pendientes de publicar, guardada en
+topic_queue.json (el workflow diario la commitea junto con los posts).
+
+- Prioridad: cada categoría tiene su propio heap ``[prioridad, seq, tema]``;
+  sacar el siguiente tema cuesta O(log n).
+- Fecha programada: los temas con ``publish_on`` futuro esperan en otro heap
+  ordenado por fecha y pasan a su categoría cuando llega el día.
+- Rotación de categorías: cada día que una categoría no se publica, su mejor
+  tema gana ROTATION_BONUS de prioridad (hasta ROTATION_WINDOW días), así
+  una categoría con temas de prioridad 1 no acapara todas las publicaciones.
+- Importación en lote: miles de temas se agregan al final de los heaps y se
+  reordenan con un solo heapify (O(n)).
+
+Uso:
+    python topic_queue.py status
+    python topic_queue.py import topics.json [--priority 2] [--category Guides]
+"""
+
+import heapq
+import json
+import os
+from datetime import datetime, timezone
+from pathlib import Path
+
+TOPIC_QUEUE_FILE = Path(__file__).parent / "topic_queue.json"
+TOPIC_QUEUE_VERSION = 1
+
+DEFAULT_PRIORITY = 99
+DEFAULT_CATEGORY = "AI Tools"
+ROTATION_BONUS = 0.5  # Prioridad que gana una categoría por cada día sin publicarse
+ROTATION_WINDOW = 4   # Días máximos que cuentan para la rotación
+
+
+def _today() -> str:
+    return datetime.now(timezone.utc).strftime('%Y-%m-%d')
+
+
+class TopicQueue:
+    """Cola de temas con prioridades, fechas programadas y rotación de categorías."""
+
+    def __init__(self, path: Path = TOPIC_QUEUE_FILE):
+        self.path = Path(path)
+        self.ready = {}        # categoría -> heap [[prioridad, seq, tema], ...]
+        self.scheduled = []    # heap [[publish_on, seq, tema], ...]
+        self.seq = 0
+        self.picks = 0
+        self.last_served = {}  # categoría -> número de pick en que se publicó por última vez
+        self.retired = set()   # keywords ya usadas (publicadas o descartadas)
+        self.keywords = set()  # keywords en cola
+
+    @classmethod
+    def load(cls, path: Path = TOPIC_QUEUE_FILE) -> "TopicQueue":
+        """Carga la cola desde disco (vacía si no existe). Los heaps se guardan
+        ya ordenados, así que no hace falta volver a armarlos."""
+        queue = cls(path)
+        try:
+            with open(queue.path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return queue
+        if data.get('version') != TOPIC_QUEUE_VERSION:
+            return queue
+        queue.ready = data['ready']
+        queue.scheduled = data['scheduled']
+        queue.seq = data['seq']
+        queue.picks = data['picks']
+        queue.last_served = data['last_served']
+        queue.retired = set(data['retired'])
+        queue.keywords = {
+            item[2]['keyword']
+            for heap in [queue.scheduled, *queue.ready.values()] for item in heap
+        }
+        return queue
+
+    def save(self):
+        """Guarda la cola de forma atómica."""
+        data = {
+            'version': TOPIC_QUEUE_VERSION,
+            'seq': self.seq,
+            'picks': self.picks,
+            'last_served': self.last_served,
+            'retired': sorted(self.retired),
+            'ready': {category: heap for category, heap in self.ready.items() if heap},
+            'scheduled': self.scheduled,
+        }
+        tmp_path = self.path.with_suffix('.tmp')
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(data, f, ensure_ascii=False, separators=(',', ':'))
+        os.replace(tmp_path, self.path)
+
+    def __len__(self) -> int:
+        return len(self.keywords)
+
+    def __contains__(self, keyword: str) -> bool:
+        return keyword in self.keywords
+
+    def _item(self, topic: dict) -> tuple:
+        """Retorna ``(heap destino, entrada)`` para un tema nuevo."""
+        self.seq += 1
+        if topic.get('publish_on'):
+            return self.scheduled, [topic['publish_on'], self.seq, topic]
+        category = topic.get('category', DEFAULT_CATEGORY)
+        return self.ready.setdefault(category, []), [topic.get('priority', DEFAULT_PRIORITY), self.seq, topic]
+
+    def _accepts(self, topic: dict, exclude: set) -> bool:
+        keyword = topic['keyword']
+        return keyword not in self.keywords and keyword not in self.retired and keyword not in exclude
+
+    def push(self, topic: dict) -> bool:
+        """Agrega un tema en O(log n); retorna False si su keyword ya se usó o está en cola."""
+        if not self._accepts(topic, set()):
+            return False
+        heap, item = self._item(topic)
+        heapq.heappush(heap, item)
+        self.keywords.add(topic['keyword'])
+        return True
+
+    def extend(self, topics: list, exclude: set = frozenset()) -> int:
+        """Importa muchos temas de una vez (un heapify por heap en lugar de un
+        push por tema). Se omiten las keywords en cola, usadas o en ``exclude``.
+        Retorna cuántos temas se agregaron."""
+        touched = []
+        added = 0
+        for topic in topics:
+            if not self._accepts(topic, exclude):
+                continue
+            heap, item = self._item(topic)
+            heap.append(item)
+            touched.append(heap)
+            self.keywords.add(topic['keyword'])
+            added += 1
+        for heap in {id(heap): heap for heap in touched}.values():
+            heapq.heapify(heap)
+        return added
+
+    def requeue(self, topic: dict):
+        """Devuelve a la cola un tema que se sacó pero no llegó a publicarse."""
+        self.retired.discard(topic['keyword'])
+        self.push(topic)
+
+    def _release_scheduled(self, today: str):
+        while self.scheduled and self.scheduled[0][0] <= today:
+            _, seq, topic = heapq.heappop(self.scheduled)
+            category = topic.get('category', DEFAULT_CATEGORY)
+            heapq.heappush(self.ready.setdefault(category, []),
+                           [topic.get('priority', DEFAULT_PRIORITY), seq, topic])
+
+    def ready_count(self, today: str | None = None) -> int:
+        """Temas disponibles hoy (sin contar los programados para más adelante)."""
+        self._release_scheduled(today or _today())
+        return sum(len(heap) for heap in self.ready.values())
+
+    def pop(self, today: str | None = None) -> dict | None:
+        """Saca el siguiente tema a publicar (None si no hay ninguno disponible hoy).
+
+        Se elige la categoría cuyo mejor tema tiene menor prioridad efectiva
+        (prioridad menos el bono de rotación); dentro de la categoría gana el
+        tema de mayor prioridad y, a igual prioridad, el más antiguo en cola.
+        """
+        self._release_scheduled(today or _today())
+        candidates = []
+        for category, heap in self.ready.items():
+            if not heap:
+                continue
+            idle = min(self.picks - self.last_served.get(category, -1), ROTATION_WINDOW)
+            candidates.append((heap[0][0] - ROTATION_BONUS * idle, heap[0][1], category))
+        if not candidates:
+            return None
+        _, _, category = min(candidates)
+        _, _, topic = heapq.heappop(self.ready[category])
+        self.last_served[category] = self.picks
+        self.picks += 1
+        self.keywords.discard(topic['keyword'])
+        self.retired.add(topic['keyword'])
+        return topic
+
+    def stats(self) -> dict:
+        return {
+            'queued': len(self),
+            'scheduled': len(self.scheduled),
+            'by_category': {category: len(heap) for category, heap in sorted(self.ready.items()) if heap},
+            'retired': len(self.retired),
+        }
+
+
+def load_topics_file(path: Path) -> list:
+    """Lee temas desde un .json (lista) o .jsonl (un tema por línea)."""
+    with open(path, 'r', encoding='utf-8') as f:
+        if str(path).endswith('.jsonl'):
+            topics = [json.loads(line) for line in f if line.strip()]
+        else:
+            topics = json.load(f)
+    for topic in topics:
+        if not topic.get('title') or not topic.get('keyword'):
+            raise ValueError(f"Topic without title/keyword in {path}: {topic}")
+    return topics
+
+
+if __name__ == "__main__":
+    import argparse
+    parser = argparse.ArgumentParser(description="Manage the persistent topic queue")
+    subparsers = parser.add_subparsers(dest='command', required=True)
+    subparsers.add_parser('status', help='Show queue size per category')
+    import_parser = subparsers.add_parser('import', help='Bulk import topics from a .json or .jsonl file')
+    import_parser.add_argument('file', type=Path)
+    import_parser.add_argument('--priority', type=int, help='Priority for topics that do not set one')
+    import_parser.add_argument('--category', help='Category for topics that do not set one')
+    args = parser.parse_args()
+
+    queue = TopicQueue.load()
+    if args.command == 'import':
+        topics = load_topics_file(args.file)
+        for topic in topics:
+            if args.priority is not None:
+                topic.setdefault('priority', args.priority)
+            if args.category:
+                topic.setdefault('category', args.category)
+        added = queue.extend(topics)
+        queue.save()
+        print(f"✓ Imported {added} of {len(topics)} topics ({len(topics) - added} duplicates skipped)")
+    stats = queue.stats()
+    print(f"📋 Topic queue: {stats['queued']} queued, {stats['scheduled']} scheduled, "
+          f"{stats['retired']} used")
+    for category, count in stats['by_category'].items():
+        print(f"   {category}: {count}")